@@ -0,0 +1,67 @@
+"""Golden-trace check for simulation fast paths.
+
+Record traces from the reference World before optimizing, then check an
+alternative engine (any World subclass or factory) against them. Run
+from the repository root:
+
+    python benchmarks/golden.py record
+    python benchmarks/golden.py check --engine mymodule:FastWorld
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import golden  # noqa: E402
+from src.world import World  # noqa: E402
+
+
+def load_engine(spec):
+    if not spec:
+        return World
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["record", "check"])
+    parser.add_argument("--scenario", action="append", choices=sorted(golden.SCENARIOS),
+                        help="defaults to every scenario")
+    parser.add_argument("--engine", help="module:callable building the world, defaults to src.world:World")
+    parser.add_argument("--reference", help="engine to show reference values from on a divergence")
+    parser.add_argument("--directory", default=os.path.join("benchmarks", "golden"))
+    parser.add_argument("--precision", type=int, default=6, help="decimal places floats are compared at")
+    args = parser.parse_args()
+
+    engine = load_engine(args.engine)
+    reference = load_engine(args.reference) if args.reference else None
+    os.makedirs(args.directory, exist_ok=True)
+    failed = False
+    for scenario in args.scenario or sorted(golden.SCENARIOS):
+        path = os.path.join(args.directory, f"{scenario}.json.gz")
+        if args.command == "record":
+            trace = golden.record(scenario, engine, args.precision)
+            golden.save(trace, path)
+            print(f"{scenario}: recorded {len(trace['ticks'])} ticks to {path}")
+            continue
+
+        divergence = golden.compare(golden.load(path), engine, reference)
+        if divergence is None:
+            print(f"{scenario}: identical")
+        else:
+            failed = True
+            print(f"{scenario}: diverged at tick {divergence['tick']} in {divergence['field']}")
+            if "differences" in divergence:
+                for key, (expected, actual) in divergence["differences"].items():
+                    print(f"  {key}: reference {expected!r}, candidate {actual!r}")
+            else:
+                print(json.dumps(divergence, indent=2, default=str))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
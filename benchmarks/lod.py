@@ -0,0 +1,68 @@
+"""Frame time of a large world with and without level-of-detail updates.
+
+Builds a world several screens wide with a crowd of monsters spawning at
+its edges, steps it once with every monster and farm at full detail and
+once with a LevelOfDetail attached, and prints milliseconds per frame and
+how many monsters were dormant at the end. Run from the repository root:
+
+    python benchmarks/lod.py --width 4000 --height 3000 --monsters 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.difficulty import DifficultyEngine  # noqa: E402
+from src.lod import LevelOfDetail  # noqa: E402
+from src.roster import Roster  # noqa: E402
+from src.world import World  # noqa: E402
+
+
+def run(args, lod):
+    random.seed(args.seed)
+    world = World(args.width, args.height)
+    world.log_actions = False
+    world.difficulty = DifficultyEngine(spawn_interval=args.spawn_interval, max_monsters=args.monsters,
+                                        seed=args.seed)
+    world.populate(Roster(size=args.villagers, seed=args.seed))
+    if lod:
+        world.lod = LevelOfDetail(args.active_distance, args.interval)
+
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        if world.game_over:
+            break
+        world.step()
+    elapsed = time.perf_counter() - start
+    return world, elapsed / max(1, world.game_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--villagers", type=int, default=6)
+    parser.add_argument("--monsters", type=int, default=200)
+    parser.add_argument("--spawn-interval", type=int, default=10)
+    parser.add_argument("--active-distance", type=int, default=6, help="grid cells around characters")
+    parser.add_argument("--interval", type=int, default=30, help="frames between bulk updates")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for lod in (False, True):
+        world, per_frame = run(args, lod)
+        line = (f"{'lod' if lod else 'full':<5} {per_frame * 1000:7.3f} ms/frame over {world.game_time} frames, "
+                f"{len(world.monsters)} monsters, {len(world.characters)} villagers")
+        if lod:
+            counts = world.lod.counts(world)
+            line += (f", {counts['dormant_monsters']} dormant, "
+                     f"{world.lod.promotions} promotions, {world.lod.demotions} demotions")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Memory growth of a long simulation run, attributed to each phase.
+
+Steps a populated World under tracemalloc, optionally drawing every few
+frames to an offscreen surface, prints objects and bytes per tick for
+every World.step phase and renderer method, and exits with status 1 when
+retained memory grows faster than --max-slope bytes per tick. Run from
+the repository root:
+
+    python benchmarks/memory.py --frames 36000 --draw-every 4
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.memtrack import MemoryTracker  # noqa: E402
+from src.roster import Roster  # noqa: E402
+from src.world import World  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=18000)
+    parser.add_argument("--villagers", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--draw-every", type=int, default=0, help="draw every N frames, 0 never draws")
+    parser.add_argument("--max-slope", type=float, default=32.0, help="allowed growth in bytes per tick")
+    parser.add_argument("--warmup", type=float, default=0.2, help="fraction of samples ignored for the slope")
+    parser.add_argument("--top", type=int, default=0, help="also list the N lines holding most memory")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    world = World()
+    world.log_actions = False
+    world.populate(Roster(size=args.villagers, seed=args.seed))
+
+    memory = MemoryTracker()
+    screen = None
+    if args.draw_every:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        pygame.init()
+        screen = pygame.Surface((world.width, world.height))
+        memory.instrument(world.get_renderer(), ("draw", "draw_ui", "draw_effect", "draw_help_button",
+                                                 "draw_help_overlay"), "renderer.")
+
+    memory.start()
+    world.memory = memory
+    for frame in range(args.frames):
+        if world.game_over:
+            break
+        world.step()
+        if screen is not None and frame % args.draw_every == 0:
+            world.draw(screen)
+
+    print(memory.format_report(args.warmup))
+    if args.top:
+        print("\n".join(memory.top(args.top)))
+    slope = memory.slope(args.warmup)
+    memory.stop()
+    if slope > args.max_slope:
+        print(f"FAIL: memory grows {slope:.1f} B/tick, limit {args.max_slope:.1f}")
+        sys.exit(1)
+    print(f"OK: memory grows {slope:.1f} B/tick, limit {args.max_slope:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Frame time of many villages stepped by MultiWorld versus one by one.
+
+Builds the same seeded villages twice, steps them once with a plain
+loop of World.step() and once with MultiWorld, and prints milliseconds
+per frame for each. Run from the repository root:
+
+    python benchmarks/multiworld.py --worlds 50 --frames 600
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.multiworld import MultiWorld  # noqa: E402
+
+
+def build(args):
+    random.seed(args.seed)
+    return MultiWorld(args.worlds, roster_config={"size": args.villagers})
+
+
+def run_loop(args):
+    worlds = build(args).worlds
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        for world in worlds:
+            if not world.game_over:
+                world.step()
+    return time.perf_counter() - start
+
+
+def run_multiworld(args):
+    arena = build(args)
+    start = time.perf_counter()
+    arena.run(args.frames)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--worlds", type=int, default=50)
+    parser.add_argument("--villagers", type=int, default=3)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name, run in (("loop", run_loop), ("multiworld", run_multiworld)):
+        best = min(run(args) for _ in range(args.repeat))
+        print(f"{name:<11} {best / args.frames * 1000:7.3f} ms/frame for {args.worlds} villages")
+
+
+if __name__ == "__main__":
+    main()
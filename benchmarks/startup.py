@@ -0,0 +1,56 @@
+"""Cold-start time of a headless episode worker.
+
+Each measurement runs in a fresh interpreter, imports the simulation,
+builds a populated World and steps it for a few frames. Run from the
+repository root:
+
+    python benchmarks/startup.py --runs 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+WORKER = """
+import sys, time
+start = time.perf_counter()
+from src.world import World
+imported = time.perf_counter()
+world = World()
+world.log_actions = False
+world.populate()
+for _ in range({frames}):
+    world.step()
+done = time.perf_counter()
+print(imported - start, done - imported, "pygame" in sys.modules)
+"""
+
+
+def measure(frames):
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", WORKER.format(frames=frames)],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    total = time.perf_counter() - start
+    import_time, run_time, loaded_pygame = output.split()
+    return total, float(import_time), float(run_time), loaded_pygame == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    results = [measure(args.frames) for _ in range(args.runs)]
+    totals, imports, runs, loaded = zip(*results)
+    print(f"process total: median {statistics.median(totals) * 1000:.1f} ms")
+    print(f"import src.world: median {statistics.median(imports) * 1000:.1f} ms")
+    print(f"World() + {args.frames} frames: median {statistics.median(runs) * 1000:.1f} ms")
+    print(f"pygame loaded: {any(loaded)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,12 @@
-import pygame
-
 class Animation:
-    def __init__(self, text, x, y, color=(255, 255, 255)):
+    def __init__(self, text, x, y, color=(255, 255, 255), born=0):
         self.text = text
         self.x = x
         self.y = y
         self.color = color
+        self.born = born  # Simulation frame the animation started (or was last refreshed)
         self.lifetime = 60  # frames
-        self.y_offset = 0
-
-    def update(self):
-        self.lifetime -= 1
-        self.y_offset -= 1  # Float up
+        self.count = 1  # How many identical messages were merged into this one
 
-    def draw(self, screen):
-        font = pygame.font.Font(None, 24)
-        alpha = min(255, self.lifetime * 4)
-        text_surface = font.render(self.text, True, self.color)
-        text_surface.set_alpha(alpha)
-        screen.blit(text_surface, (self.x, self.y + self.y_offset)) 
\ No newline at end of file
+    def is_expired(self, now):
+        return now - self.born >= self.lifetime
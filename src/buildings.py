@@ -14,4 +14,31 @@ class House:
             1: {"hp_regen": 0.05},
             2: {"hp_regen": 0.1},
             3: {"hp_regen": 0.2}
-        } 
\ No newline at end of file
+        }
+
+    def upgrade_cost(self):
+        # Wood needed for the next level, None once fully upgraded
+        if self.level >= self.max_level:
+            return None
+        return self.upgrade_costs[self.level + 1]["wood"]
+
+    def hp_regen(self):
+        return self.level_benefits[self.level]["hp_regen"]
+
+
+class Farm:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.plots = 1
+        self.capacity = 4  # Nearby farming merges into this farm up to this many plots
+        self.growth = 0
+        self.growth_time = 1800  # Frames until the crops are ripe (30 seconds at 60 FPS)
+        self.dormant = False  # Grown in bulk by LevelOfDetail while no character is near
+
+    def grow(self, frames=1):
+        # More plots ripen faster
+        self.growth = min(self.growth_time, self.growth + frames * self.plots)
+
+    def is_ripe(self):
+        return self.growth >= self.growth_time
@@ -0,0 +1,88 @@
+import datetime
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+class FrameCapture:
+    # Screenshots and timelapse sequences. The frame is copied on the calling thread and
+    # encoded to PNG by a small worker pool, so capturing never stalls the game loop.
+    def __init__(self, directory="screenshots", workers=2, max_pending=8, sequence_interval=30):
+        self.directory = directory
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="capture")
+        self.max_pending = max_pending
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.saved = 0
+        self.dropped = 0  # Frames skipped because the writers were behind
+        # Sequence capture: every sequence_interval displayed frames while active
+        self.sequence_interval = sequence_interval
+        self.sequence_directory = None
+        self.sequence_frame = 0
+        self.sequence_count = 0
+
+    def _submit(self, surface, filename, announce):
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.dropped += 1
+                return None
+            self.pending += 1
+        frame = surface.copy()
+        self.pool.submit(self._write, frame, filename, announce)
+        return filename
+
+    def _write(self, frame, filename, announce):
+        saved = False
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            pygame.image.save(frame, filename)
+            saved = True
+            if announce:
+                print(f"Screenshot saved as {filename}")
+        finally:
+            # Workers finish concurrently, so the counters only change under the lock
+            with self.lock:
+                self.pending -= 1
+                self.saved += saved
+
+    def screenshot(self, surface):
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        return self._submit(surface, os.path.join(self.directory, f"screenshot-{timestamp}.png"), True)
+
+    @property
+    def recording(self):
+        return self.sequence_directory is not None
+
+    def start_sequence(self, interval=None):
+        if interval is not None:
+            self.sequence_interval = interval
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.sequence_directory = os.path.join(self.directory, f"sequence-{timestamp}")
+        self.sequence_frame = 0
+        self.sequence_count = 0
+        print(f"Recording frames to {self.sequence_directory}")
+
+    def stop_sequence(self):
+        if self.sequence_directory is not None:
+            print(f"Recorded {self.sequence_count} frames to {self.sequence_directory}")
+        self.sequence_directory = None
+
+    def toggle_sequence(self):
+        if self.recording:
+            self.stop_sequence()
+        else:
+            self.start_sequence()
+
+    def on_frame(self, surface):
+        # Called once per displayed frame
+        if self.sequence_directory is None:
+            return
+        if self.sequence_frame % self.sequence_interval == 0:
+            filename = os.path.join(self.sequence_directory, f"frame-{self.sequence_count:06d}.png")
+            if self._submit(surface, filename, False):
+                self.sequence_count += 1
+        self.sequence_frame += 1
+
+    def close(self):
+        self.stop_sequence()
+        self.pool.shutdown(wait=True)
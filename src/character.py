@@ -1,11 +1,15 @@
 import random
 import math
-import pygame
 from .enums import Action, Resource
+from .clock import STOPPED
+
+ACTIONS = list(Action)
 
 class Character:
     def __init__(self, name, x, y):
         self.name = name
+        self.slot = None  # Index in World.characters, kept up to date by the world
+        self.born = 0  # World.game_time when the character joined
         self.inventory = {
             Resource.WOOD: 0,
             Resource.FOOD: 0,
@@ -17,6 +21,7 @@ class Character:
             Action.CHOP_TREE: random.uniform(0.1, 0.3),
             Action.HARVEST_FOOD: random.uniform(0.1, 0.3),
             Action.BUILD_HOUSE: random.uniform(0.1, 0.3),
+            Action.UPGRADE_HOUSE: random.uniform(0.1, 0.3),
             Action.FARM_FOOD: random.uniform(0.1, 0.3)
         }
         self.learning_rate = 0.1
@@ -42,13 +47,23 @@ class Character:
         self.last_action = None
         self.last_reward = 0
         self.total_reward = 0
+        self.pending_reward = 0  # Rewards of finished and restarted actions, collected by an env wrapper
         self.is_moving = False
         self.current_target = None
+        self.path = None  # Waypoints to current_target, set by the world's navigator
+        self.path_index = -1
+        self.segment_left = 0
+        self.step_x = 0
+        self.step_y = 0
         self.action_state = "idle"
         self.gathering_time = 0
         self.gathering_duration = 60
         
-        # Health system
+        # Health system. HP is stored as its value at hp_tick plus a rate per frame and worked
+        # out when read, so nothing has to touch it between events; see the hp property.
+        self.clock = STOPPED  # The world once the character joins one
+        self.hp_rate = 0.0
+        self.hp_version = 0  # Bumped on every change, so stale death predictions can be told apart
         self.max_hp = 100
         self.hp = self.max_hp
         self.hp_decay = 0.02
@@ -61,6 +76,16 @@ class Character:
             'farmer': random.uniform(0.8, 1.2)
         }
 
+        # Multipliers choose_action applies to the Q-values in each situation
+        self.biases = {
+            'hungry_harvest': 1.5,  # HP below 70
+            'hungry_farm': 1.3,
+            'low_wood_chop': 1.2,  # Fewer than 3 wood
+            'build': 1.2,  # Enough wood for a house
+            'upgrade': 1.2,  # Enough wood for an upgrade
+            'food_farm': 1.1,  # Food to plant
+        }
+
         # Add after other initializations
         self.is_dead = False
 
@@ -68,82 +93,100 @@ class Character:
         self.attack_damage = 3
         self.attack_range = 40
         self.attack_cooldown = 45  # 0.75 seconds at 60 FPS
-        self.current_attack_cooldown = 0
+        self.attack_ready = 0  # Frame from which the character can attack again
 
         # Level system
         self.level = 1
         self.exp = 0
         self.exp_to_next_level = 5  # Initial exp needed (increases with each level)
 
+    @property
+    def hp(self):
+        # Linear between events, held within 0..max_hp
+        hp = self._hp + self.hp_rate * (self.clock.game_time - self.hp_tick)
+        if hp <= 0:
+            return 0
+        return hp if hp < self.max_hp else self.max_hp
+
+    @hp.setter
+    def hp(self, value):
+        self._hp = value
+        self.hp_tick = self.clock.game_time
+        self.hp_version += 1
+        self.clock.schedule_death(self)
+
+    def set_hp_rate(self, rate):
+        # Decay plus whatever regeneration applies where the character stands
+        if rate != self.hp_rate:
+            hp = self.hp
+            self.hp_rate = rate
+            self.hp = hp
+
+    def death_tick(self):
+        # First frame at which HP reaches 0, or None while it is not falling
+        if self._hp <= 0:
+            return self.hp_tick
+        if self.hp_rate >= 0:
+            return None
+        return self.hp_tick + math.ceil(self._hp / -self.hp_rate)
+
+    def adopt(self, clock):
+        # Move HP and cooldown over to another clock, keeping their current values
+        hp, cooldown = self.hp, self.current_attack_cooldown
+        self.clock = clock
+        self.current_attack_cooldown = cooldown
+        self.hp = hp
+
     def get_current_speed(self):
         hp_percentage = self.hp / self.max_hp
         speed_multiplier = 0.5 + hp_percentage
         return self.base_speed * speed_multiplier
 
+    def set_path(self, waypoints):
+        # Waypoints towards current_target; the last one is the target itself
+        self.path = waypoints
+        self.path_index = -1
+        self.segment_left = 0
+
+    def next_segment(self):
+        # One square root per segment; every tick after that just steps along it
+        self.path_index += 1
+        waypoint = self.path[self.path_index]
+        dx = waypoint[0] - self.x
+        dy = waypoint[1] - self.y
+        length = math.sqrt(dx**2 + dy**2)
+        self.segment_left = length
+        if length > 0:
+            self.step_x = dx / length
+            self.step_y = dy / length
+
     def move_to_target(self):
         if not self.current_target:
             return True
+        if self.path is None:
+            self.set_path([self.current_target])
+        if self.path_index < 0:
+            self.next_segment()
             
-        dx = self.current_target[0] - self.x
-        dy = self.current_target[1] - self.y
-        distance = math.sqrt(dx**2 + dy**2)
-        
         current_speed = self.get_current_speed()
         
-        if distance > current_speed:
-            self.x += (dx/distance) * current_speed
-            self.y += (dy/distance) * current_speed
+        if self.segment_left > current_speed:
+            self.x += self.step_x * current_speed
+            self.y += self.step_y * current_speed
+            self.segment_left -= current_speed
             return False
-        else:
-            self.x = self.current_target[0]
-            self.y = self.current_target[1]
-            return True
-
-    def update(self):
-        if self.action_state == "moving":
-            if self.move_to_target():
-                self.action_state = "gathering"
-                self.gathering_time = 0
-        elif self.action_state == "gathering":
-            self.gathering_time += 1
-            if self.gathering_time >= self.gathering_duration:
-                self.action_state = "idle"
-                return True
-        return False
 
-    def update_needs(self):
-        self.hp = max(0, self.hp - self.hp_decay)
-        if self.hp <= 0:
-            self.is_dead = True
+        waypoint = self.path[self.path_index]
+        self.x = waypoint[0]
+        self.y = waypoint[1]
+        if self.path_index + 1 < len(self.path):
+            self.next_segment()
+            return False
+        self.path = None
+        return True
 
     def choose_action(self):
-        self.epsilon = max(self.min_epsilon, self.epsilon * self.epsilon_decay)
-        
-        if random.random() < self.epsilon:
-            return random.choice(list(Action))
-            
-        action_weights = {}
-        
-        for action in Action:
-            action_weights[action] = self.q_table[action]
-        
-        if self.hp < 70:
-            action_weights[Action.HARVEST_FOOD] *= 1.5 * self.traits['gatherer']
-            action_weights[Action.FARM_FOOD] *= 1.3 * self.traits['farmer']
-            
-        if self.inventory[Resource.WOOD] < 3:
-            action_weights[Action.CHOP_TREE] *= 1.2 * self.traits['gatherer']
-            
-        if self.inventory[Resource.WOOD] >= 5:
-            action_weights[Action.BUILD_HOUSE] *= 1.2 * self.traits['builder']
-            
-        if self.inventory[Resource.FOOD] >= 1:
-            action_weights[Action.FARM_FOOD] *= 1.1 * self.traits['farmer']
-            
-        for action in action_weights:
-            action_weights[action] += random.uniform(0, 0.1)
-            
-        return max(action_weights.items(), key=lambda x: x[1])[0]
+        return choose_actions([self])[0]
 
     def learn(self, action, reward):
         old_value = self.q_table[action]
@@ -153,39 +196,24 @@ class Character:
                    self.learning_rate * (reward + self.discount_factor * next_max)
         
         self.q_table[action] = new_value
+        self.remember(action, reward)
+
+    def remember(self, action, reward):
+        # Bookkeeping only; a replay learner does the Q-update instead
         self.last_action = action
         self.last_reward = reward
         self.total_reward += reward
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.color, 
-                        (self.x - self.size/2, self.y - self.size/2, 
-                         self.size, self.size))
-        
-        self.draw_status_bars(screen)
-        
-        font = pygame.font.Font(None, 20)
-        name_text = font.render(self.name, True, (255, 255, 255))
-        screen.blit(name_text, (self.x - name_text.get_width()/2, self.y - 65))
-
-    def draw_status_bars(self, screen):
-        bar_width = 50
-        bar_height = 4
-        start_y = self.y - 50
-        
-        hp_percentage = self.hp / self.max_hp
-        pygame.draw.rect(screen, (100, 0, 0), 
-                        (self.x - bar_width/2, start_y, bar_width, bar_height))
-        pygame.draw.rect(screen, (255, 0, 0), 
-                        (self.x - bar_width/2, start_y, 
-                         bar_width * hp_percentage, bar_height))
+    @property
+    def current_attack_cooldown(self):
+        return max(0, self.attack_ready - self.clock.game_time)
 
-    def can_attack(self):
-        return self.current_attack_cooldown <= 0
+    @current_attack_cooldown.setter
+    def current_attack_cooldown(self, frames):
+        self.attack_ready = self.clock.game_time + frames
 
-    def update_attack_cooldown(self):
-        if self.current_attack_cooldown > 0:
-            self.current_attack_cooldown -= 1
+    def can_attack(self):
+        return self.clock.game_time >= self.attack_ready
 
     def attack_monster(self, monster):
         if self.can_attack():
@@ -207,4 +235,52 @@ class Character:
         # Improve stats with level up
         self.max_hp += 10
         self.hp = self.max_hp  # Heal to full on level up
-        self.attack_damage += 1 
\ No newline at end of file
+        self.attack_damage += 1 
+
+def choose_actions(characters):
+    # Epsilon-greedy choice for a whole batch of idle characters. Random numbers are drawn
+    # per character in the same order as always, so seeded runs do not change.
+    actions = []
+    for character in characters:
+        character.epsilon = max(character.min_epsilon, character.epsilon * character.epsilon_decay)
+        if random.random() < character.epsilon:
+            actions.append(random.choice(ACTIONS))
+            continue
+
+        q_table = character.q_table
+        traits = character.traits
+        biases = character.biases
+        wood = character.inventory[Resource.WOOD]
+        chop = q_table[Action.CHOP_TREE]
+        harvest = q_table[Action.HARVEST_FOOD]
+        build = q_table[Action.BUILD_HOUSE]
+        upgrade = q_table[Action.UPGRADE_HOUSE]
+        farm = q_table[Action.FARM_FOOD]
+
+        if character.hp < 70:
+            harvest *= biases['hungry_harvest'] * traits['gatherer']
+            farm *= biases['hungry_farm'] * traits['farmer']
+        if wood < 3:
+            chop *= biases['low_wood_chop'] * traits['gatherer']
+        if wood >= 5:
+            build *= biases['build'] * traits['builder']
+        if wood >= 8:
+            upgrade *= biases['upgrade'] * traits['builder']
+        if character.inventory[Resource.FOOD] >= 1:
+            farm *= biases['food_farm'] * traits['farmer']
+
+        weights = {
+            Action.CHOP_TREE: chop,
+            Action.HARVEST_FOOD: harvest,
+            Action.BUILD_HOUSE: build,
+            Action.UPGRADE_HOUSE: upgrade,
+            Action.FARM_FOOD: farm,
+        }
+        best_action = None
+        best_weight = None
+        for action in ACTIONS:
+            weight = weights[action] + random.uniform(0, 0.1)
+            if best_weight is None or weight > best_weight:
+                best_action, best_weight = action, weight
+        actions.append(best_action)
+    return actions
@@ -0,0 +1,10 @@
+class StoppedClock:
+    # What characters and monsters read the frame number from until a world adopts them.
+    # A World provides the same two members: game_time and schedule_death().
+    game_time = 0
+
+    def schedule_death(self, character):
+        pass
+
+
+STOPPED = StoppedClock()
@@ -0,0 +1,133 @@
+import random
+from collections import namedtuple
+
+MonsterStats = namedtuple("MonsterStats", ["level", "speed", "damage", "max_hp"])
+
+class DifficultyEngine:
+    # The classic rules: monsters level up every minute and spawn one at a time
+    def __init__(self, spawn_interval=300, max_monsters=5, level_interval=60 * 60,
+                 max_level=100, seed=None):
+        self.spawn_interval = spawn_interval  # 5 seconds at 60 FPS
+        self.max_monsters = max_monsters
+        self.level_interval = level_interval
+        self.spawn_timer = 0
+        # With a seed, spawn positions come from a private generator and replay exactly
+        self.random = random.Random(seed) if seed is not None else random
+        # Stats for the first max_level levels are computed up front, later ones when first needed
+        self.stats_table = [None] + [self.make_stats(level) for level in range(1, max_level + 1)]
+
+    def make_stats(self, level):
+        return MonsterStats(
+            level=level,
+            speed=2 + (level * 0.2),
+            damage=3 + (level * 2),  # Increased base damage and scaling
+            max_hp=10 + (level * 5),
+        )
+
+    def stats_for(self, level):
+        level = max(1, level)
+        table = self.stats_table
+        while level >= len(table):
+            # Scaling has no cap; grow the table rather than clamp to its last level
+            table.append(self.make_stats(len(table)))
+        return table[level]
+
+    def monster_level(self, world):
+        return max(1, (world.game_time // self.level_interval) + 1)
+
+    def update(self, world):
+        self.spawn_timer += 1
+        if self.spawn_timer >= self.spawn_interval and len(world.monsters) < self.max_monsters:
+            world.spawn_monster(self.monster_level(world), self.random)
+            self.spawn_timer = 0
+
+
+class WaveDifficulty(DifficultyEngine):
+    # Quiet periods broken by waves that grow each time
+    def __init__(self, wave_interval=60 * 45, first_wave=3, wave_growth=2, **kwargs):
+        kwargs.setdefault("max_monsters", 40)
+        super().__init__(**kwargs)
+        self.wave_interval = wave_interval
+        self.first_wave = first_wave
+        self.wave_growth = wave_growth
+        self.waves = 0
+
+    def update(self, world):
+        self.spawn_timer += 1
+        if self.spawn_timer < self.wave_interval:
+            return
+        self.spawn_timer = 0
+        size = self.first_wave + self.waves * self.wave_growth
+        level = self.monster_level(world)
+        for _ in range(min(size, self.max_monsters - len(world.monsters))):
+            world.spawn_monster(level, self.random)
+        self.waves += 1
+        world.add_effect(f"Wave {self.waves}!", world.width // 2 - 40, world.game_area_start + 20,
+                         (255, 80, 80))
+
+
+class AdaptiveDifficulty(DifficultyEngine):
+    # Stronger villages get tougher and more frequent monsters, struggling ones get a break
+    def __init__(self, strength_per_level=3.0, max_offset=5, **kwargs):
+        super().__init__(**kwargs)
+        self.base_spawn_interval = self.spawn_interval
+        self.strength_per_level = strength_per_level
+        self.max_offset = max_offset
+
+    def village_strength(self, world):
+        # Levels above a fresh village of the same size, plus house levels
+        strength = sum(character.level - 1 for character in world.characters)
+        strength += sum(house.level for house in world.houses)
+        return strength
+
+    def level_offset(self, world):
+        offset = int(self.village_strength(world) / self.strength_per_level)
+        if world.characters and sum(c.hp for c in world.characters) < 0.3 * sum(c.max_hp for c in world.characters):
+            offset -= 1
+        return max(-self.max_offset, min(self.max_offset, offset))
+
+    def monster_level(self, world):
+        return max(1, super().monster_level(world) + self.level_offset(world))
+
+    def update(self, world):
+        # Strength only matters when a spawn is due, so it is measured at most once per interval
+        self.spawn_timer += 1
+        if self.spawn_timer < self.spawn_interval or len(world.monsters) >= self.max_monsters:
+            return
+        offset = self.level_offset(world)
+        world.spawn_monster(max(1, super().monster_level(world) + offset), self.random)
+        self.spawn_interval = max(60, self.base_spawn_interval - offset * 30)
+        self.spawn_timer = 0
+
+
+class ScheduledDifficulty(DifficultyEngine):
+    # Replays a fixed list of (frame, count, level) spawns for reproducible benchmarks and training
+    def __init__(self, schedule, seed=0, repeat_every=None, **kwargs):
+        kwargs.setdefault("max_monsters", 10 ** 6)
+        super().__init__(seed=seed, **kwargs)
+        self.schedule = sorted(schedule)
+        self.repeat_every = repeat_every
+        self.next_entry = 0
+        self.cycle_start = 0
+
+    @classmethod
+    def ramp(cls, frames, interval=300, start_count=1, count_step=1, level_every=3600, seed=0):
+        # A steady ramp of spawns, handy as a standard load test
+        schedule = [(frame, start_count + (frame // level_every) * count_step, frame // level_every + 1)
+                    for frame in range(interval, frames + 1, interval)]
+        return cls(schedule, seed=seed)
+
+    def update(self, world):
+        schedule = self.schedule
+        while self.next_entry < len(schedule):
+            frame, count, level = schedule[self.next_entry]
+            if self.cycle_start + frame > world.game_time:
+                break
+            for _ in range(min(count, self.max_monsters - len(world.monsters))):
+                world.spawn_monster(level, self.random)
+            self.next_entry += 1
+
+        if self.next_entry == len(schedule) and self.repeat_every:
+            if world.game_time >= self.cycle_start + self.repeat_every:
+                self.cycle_start += self.repeat_every
+                self.next_entry = 0
@@ -0,0 +1,230 @@
+import random
+import numpy as np
+from .enums import Resource
+
+class Ecology:
+    # Tree density, soil fertility and wild food per cell of the world grid, advanced as a
+    # cellular automaton every update_interval frames. Trees and food only become entities
+    # (position tuples in World.tree_positions/food_positions) when an agent looks for them.
+    def __init__(self, grid, update_interval=300, tree_capacity=3, food_capacity=2,
+                 growth_rate=0.08, spread_rate=0.12, food_rate=0.02, farm_bonus=20.0,
+                 query_radius=320, per_query=3, supply_per_update=1, max_supply=3):
+        self.grid = grid
+        self.update_interval = update_interval
+        self.timer = 0
+        self.tree_capacity = tree_capacity  # Trees a fully grown cell can hold
+        self.food_capacity = food_capacity
+        self.growth_rate = growth_rate
+        self.spread_rate = spread_rate
+        self.food_rate = food_rate
+        self.farm_bonus = farm_bonus  # How much faster food grows next to farms
+        self.query_radius = query_radius
+        self.per_query = per_query  # Entities materialised per query at most
+        # Grown resources only turn into entities from a budget refilled every update, so the
+        # village finds about as much as the old one-tree-per-interval respawn gave it
+        self.supply_per_update = supply_per_update
+        self.max_supply = max_supply
+        self.supply = {"tree": 0, "food": 0}
+        self.margin = 10
+        # Drawn from the global generator so seeded worlds stay reproducible
+        self.rng = np.random.default_rng(random.getrandbits(64))
+
+        shape = (grid.rows, grid.cols)
+        self.fertility = self._noise(shape)
+        self.density = np.where(self.rng.random(shape) < 0.2, 0.9, 0.15).astype(np.float32)
+        self.density *= self.fertility
+        self.food = (self.rng.random(shape) * 0.8 * self.fertility).astype(np.float32)
+        # Entities already materialised per cell, and which positions came from the grid
+        self.tree_count = np.zeros(shape, dtype=np.int16)
+        self.food_count = np.zeros(shape, dtype=np.int16)
+        self.counts = {"tree": self.tree_count, "food": self.food_count}
+        self.grown = {"tree": set(), "food": set()}
+        # Houses block cells in the shared grid; this is a view of its bytearray, not a copy
+        self.blocked = np.frombuffer(grid.blocked, dtype=np.uint8).reshape(shape)
+        self.farm_influence = np.zeros(shape, dtype=np.float32)
+        self.farms_version = None
+
+        # Work buffers for the automaton step
+        self.padded = np.zeros((shape[0] + 2, shape[1] + 2), dtype=np.float32)
+        self.neighbours = np.zeros(shape, dtype=np.float32)
+        self.scratch = np.zeros(shape, dtype=np.float32)
+        ys, xs = np.mgrid[0:shape[0], 0:shape[1]]
+        self.cell_x = ((xs + 0.5) * grid.cell_size).astype(np.float32)
+        self.cell_y = ((ys + 0.5) * grid.cell_size + grid.top).astype(np.float32)
+
+    def _noise(self, shape):
+        # Smooth fertility: white noise blurred a few times, scaled to 0.2..1
+        field = self.rng.random(shape).astype(np.float32)
+        for _ in range(3):
+            padded = np.pad(field, 1, mode="edge")
+            field = (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]
+                     + padded[1:-1, 1:-1]) / 5
+        low, high = field.min(), field.max()
+        return (0.2 + 0.8 * (field - low) / max(high - low, 1e-6)).astype(np.float32)
+
+    def _neighbour_mean(self, field):
+        padded = self.padded
+        padded[1:-1, 1:-1] = field
+        out = self.neighbours
+        np.add(padded[:-2, :-2], padded[:-2, 1:-1], out=out)
+        out += padded[:-2, 2:]
+        out += padded[1:-1, :-2]
+        out += padded[1:-1, 2:]
+        out += padded[2:, :-2]
+        out += padded[2:, 1:-1]
+        out += padded[2:, 2:]
+        out /= 8
+        return out
+
+    def sync_farms(self, farms):
+        if farms.version == self.farms_version:
+            return
+        self.farms_version = farms.version
+        influence = self.farm_influence
+        influence.fill(0)
+        for farm in farms:
+            cx, cy = self.grid.cell_of(farm.x, farm.y)
+            influence[max(0, cy - 1):cy + 2, max(0, cx - 1):cx + 2] += 0.5
+            influence[cy, cx] += 0.5
+        np.minimum(influence, 1.0, out=influence)
+
+    def step(self):
+        density = self.density
+        scratch = self.scratch
+        # Local growth: logistic in the cell's own density, scaled by fertility
+        np.subtract(1.0, density, out=scratch)
+        scratch *= density
+        scratch *= self.fertility
+        scratch *= self.growth_rate
+        # Spreading: seeds from the eight neighbours land in the free part of the cell
+        spread = self._neighbour_mean(density)
+        spread *= 1.0 - density
+        spread *= self.fertility
+        spread *= self.spread_rate
+        density += scratch
+        density += spread
+        density[self.blocked.astype(bool)] = 0  # Nothing grows under houses
+        np.clip(density, 0.0, 1.0, out=density)
+
+        # Wild food grows in fertile, open cells and much faster around farms
+        food = self.food
+        np.multiply(self.farm_influence, self.farm_bonus, out=scratch)
+        scratch += 1.0
+        scratch *= self.fertility
+        scratch *= 1.0 - 0.5 * density
+        scratch *= 1.0 - food
+        scratch *= self.food_rate
+        food += scratch
+        np.clip(food, 0.0, 1.0, out=food)
+
+    def update(self, world):
+        self.timer += 1
+        if self.timer >= self.update_interval:
+            self.timer = 0
+            self.sync_farms(world.farms)
+            self.step()
+            for kind in self.supply:
+                self.supply[kind] = min(self.max_supply, self.supply[kind] + self.supply_per_update)
+
+    def available(self, kind):
+        if kind == "tree":
+            return np.floor(self.density * self.tree_capacity) - self.tree_count
+        return np.floor(self.food * self.food_capacity) - self.food_count
+
+    def populate(self, world):
+        # Initial trees and food, scattered over the cells that have grown them
+        for kind, limit in (("tree", world.max_trees), ("food", world.max_food)):
+            available = self.available(kind)
+            weights = np.clip(available, 0, None).ravel()
+            cells = np.repeat(np.arange(weights.size), weights.astype(np.int64))
+            if not cells.size:
+                continue
+            chosen = self.rng.choice(cells, size=min(limit, cells.size), replace=False)
+            for index in chosen:
+                self._add(world, kind, index // self.grid.cols, index % self.grid.cols)
+
+    def _add(self, world, kind, row, col):
+        half = self.grid.cell_size // 2
+        x = int(self.cell_x[row, col]) + random.randint(-half + 5, half - 5)
+        y = int(self.cell_y[row, col]) + random.randint(-half + 5, half - 5)
+        # Edge cells reach past the screen; keep what grows there inside it
+        x = min(max(x, self.margin), world.width - self.margin)
+        y = min(max(y, self.grid.top + self.margin), world.height - self.margin)
+        positions = world.tree_positions if kind == "tree" else world.food_positions
+        positions.append((x, y))
+        self.counts[kind][row, col] += 1
+        self.grown[kind].add((x, y))
+
+    def _evict(self, world, kind, positions, x, y, needed):
+        # Return far-away, untargeted entities to their cells to make room under the cap
+        radius = self.query_radius ** 2
+        grown = self.grown[kind]
+        targets = {character.current_target for character in world.characters}
+        far = [p for p in positions if p in grown and p not in targets
+               and (p[0] - x) ** 2 + (p[1] - y) ** 2 > radius]
+        far.sort(key=lambda p: (p[0] - x) ** 2 + (p[1] - y) ** 2, reverse=True)
+        for position in far[:needed]:
+            positions.remove(position)
+            grown.discard(position)
+            cx, cy = self.grid.cell_of(*position)
+            self.counts[kind][cy, cx] -= 1
+        return min(needed, len(far))
+
+    def wanted(self, world, kind, positions, x, y):
+        # Only a character with nothing left to go for within query_radius needs new entities
+        radius = self.query_radius ** 2
+        targets = {character.current_target for character in world.characters}
+        return not any((p[0] - x) ** 2 + (p[1] - y) ** 2 <= radius and p not in targets
+                       for p in positions)
+
+    def materialize(self, world, kind, x, y, count=None):
+        # Turn the nearest grown-but-unclaimed resources around (x, y) into entities
+        if kind == "tree":
+            positions, limit, resource = world.tree_positions, world.max_trees, Resource.WOOD
+        else:
+            positions, limit, resource = world.food_positions, world.max_food, Resource.FOOD
+        if not self.supply[kind] or not self.wanted(world, kind, positions, x, y):
+            return 0
+        count = min(count or self.per_query, self.supply[kind])
+        evicted = 0
+        if len(positions) + count > limit:
+            evicted = self._evict(world, kind, positions, x, y, len(positions) + count - limit)
+            world.resources[resource] -= evicted
+        count = min(count, limit - len(positions))
+        if count <= 0:
+            return 0
+
+        grid = self.grid
+        radius = self.query_radius // grid.cell_size
+        cx, cy = grid.cell_of(x, y)
+        y0, y1 = max(0, cy - radius), min(grid.rows, cy + radius + 1)
+        x0, x1 = max(0, cx - radius), min(grid.cols, cx + radius + 1)
+        available = self.available(kind)[y0:y1, x0:x1]
+        rows, cols = np.nonzero(available > 0)
+        if not len(rows):
+            return 0
+        distance = ((self.cell_x[y0:y1, x0:x1][rows, cols] - x) ** 2
+                    + (self.cell_y[y0:y1, x0:x1][rows, cols] - y) ** 2)
+        added = 0
+        for i in np.argsort(distance, kind="stable"):
+            for _ in range(min(int(available[rows[i], cols[i]]), count - added)):
+                self._add(world, kind, y0 + rows[i], x0 + cols[i])
+                added += 1
+            if added >= count:
+                break
+        world.resources[resource] += added
+        self.supply[kind] -= added
+        return added
+
+    def consume(self, position, kind):
+        # A chopped tree thins its cell, eaten food empties it. Resources placed by hand or
+        # dropped by farms never came from a cell and leave the grid alone.
+        if position not in self.grown[kind]:
+            return
+        self.grown[kind].discard(position)
+        cx, cy = self.grid.cell_of(*position)
+        self.counts[kind][cy, cx] -= 1
+        if kind == "tree":
+            self.density[cy, cx] = max(0.0, self.density[cy, cx] - 1.0 / self.tree_capacity)
+        else:
+            self.food[cy, cx] = max(0.0, self.food[cy, cx] - 1.0 / self.food_capacity)
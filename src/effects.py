@@ -0,0 +1,56 @@
+import copy
+from collections import OrderedDict
+from .animation import Animation
+
+class EffectSystem:
+    def __init__(self, max_effects=100, coalesce_cell=20):
+        self.max_effects = max_effects
+        self.coalesce_cell = coalesce_cell
+        # key -> animation, least recently started or refreshed first
+        self.effects = OrderedDict()
+        self.coalesced = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.effects)
+
+    def __iter__(self):
+        return iter(self.effects.values())
+
+    def add(self, text, x, y, color, now, anchor=None):
+        # Identical messages for the same anchor (or the same spot) merge into one effect
+        if anchor is not None:
+            key = (text, id(anchor))
+        else:
+            key = (text, int(x) // self.coalesce_cell, int(y) // self.coalesce_cell)
+
+        effect = self.effects.get(key)
+        if effect is not None and not effect.is_expired(now):
+            effect.count += 1
+            effect.x, effect.y = x, y
+            effect.born = now
+            self.effects.move_to_end(key)
+            self.coalesced += 1
+            return effect
+
+        effect = Animation(text, x, y, color, born=now)
+        self.effects[key] = effect
+        self.effects.move_to_end(key)
+        if len(self.effects) > self.max_effects:
+            self.effects.popitem(last=False)
+            self.dropped += 1
+        return effect
+
+    def update(self, now):
+        # Effects are ordered by start time, so expired ones are always at the front
+        effects = self.effects
+        while effects:
+            key, effect = next(iter(effects.items()))
+            if not effect.is_expired(now):
+                break
+            del effects[key]
+
+    def snapshot(self):
+        snapshot = copy.copy(self)
+        snapshot.effects = OrderedDict((key, copy.copy(effect)) for key, effect in self.effects.items())
+        return snapshot
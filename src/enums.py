@@ -2,6 +2,7 @@ from enum import Enum
 
 class Action(Enum):
     BUILD_HOUSE = "build_house"
+    UPGRADE_HOUSE = "upgrade_house"
     CHOP_TREE = "chop_tree"
     HARVEST_FOOD = "harvest_food"
     FARM_FOOD = "farm_food"
@@ -0,0 +1,239 @@
+import random
+import numpy as np
+from .enums import Resource
+from .character import ACTIONS
+from .world import World
+from .roster import Roster
+
+# One row per agent; positions and deltas are scaled to the world size
+FEATURES = (
+    "alive", "x", "y", "hp", "level", "wood", "food", "houses", "idle",
+    "tree_distance", "tree_dx", "tree_dy",
+    "food_distance", "food_dx", "food_dy",
+    "monster_distance", "monster_dx", "monster_dy",
+    "house_distance", "house_dx", "house_dy",
+)
+NEAREST_COLUMNS = {"tree": 9, "food": 12, "monster": 15, "house": 18}
+DEATH_PENALTY = -10.0
+
+
+class VillageEnv:
+    # reset()/step(actions) over one World, one decision (60 frames) per step.
+    # Observations are written into the same preallocated array every step, copy it to keep it.
+    def __init__(self, max_agents=8, roster_config=None, frames_per_step=60, max_steps=1000, out=None):
+        self.max_agents = max_agents
+        self.roster_config = roster_config or {}
+        self.frames_per_step = frames_per_step
+        self.max_steps = max_steps
+        self.action_count = len(ACTIONS)
+        self.observation_shape = (max_agents, len(FEATURES))
+
+        self.obs = out if out is not None else np.zeros(self.observation_shape, dtype=np.float32)
+        self.rewards = np.zeros(max_agents, dtype=np.float32)
+        self.dones = np.zeros(max_agents, dtype=bool)
+        self.agent_xy = np.zeros((max_agents, 2), dtype=np.float32)
+        self.alive = self.obs[:, 0]
+        self.rows = np.arange(max_agents, dtype=np.intp)
+        self.nearest = np.zeros(max_agents, dtype=np.intp)
+        self.index = np.zeros(max_agents, dtype=np.intp)
+        self.scratch = np.zeros(max_agents, dtype=np.float32)
+        # Entity positions, nearest-target work buffers and flat views of them; grown on demand
+        self.points = {}
+        self.capacity = 0
+        self._grow(32)
+
+        self.world = None
+        self.agents = [None] * max_agents  # Agent index -> Character, fixed for the character's life
+        self.steps = 0
+
+    def _grow(self, capacity):
+        self.capacity = capacity
+        for kind in NEAREST_COLUMNS:
+            self.points[kind] = np.zeros((capacity, 2), dtype=np.float32)
+        self.diff = np.zeros((self.max_agents, capacity, 2), dtype=np.float32)
+        self.square = np.zeros((self.max_agents, capacity, 2), dtype=np.float32)
+        self.distance = np.zeros((self.max_agents, capacity), dtype=np.float32)
+        self.diff_flat = self.diff.reshape(-1)
+        self.distance_flat = self.distance.reshape(-1)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            random.seed(seed)
+        self.world = World()
+        self.world.log_actions = False
+        self.world.auto_decide = False
+        self.world.populate(Roster.from_config(self.roster_config))
+        self.agents = [None] * self.max_agents
+        self.steps = 0
+        self._sync_agents()
+        self.rewards.fill(0)
+        self.dones.fill(False)
+        return self.observe(), {"game_time": self.world.game_time}
+
+    def _sync_agents(self):
+        # Dead characters free their agent index; newborns take free indices in order
+        agents = self.agents
+        for i, character in enumerate(agents):
+            if character is not None and character.is_dead:
+                agents[i] = None
+        known = set(id(c) for c in agents if c is not None)
+        for character in self.world.characters:
+            if id(character) in known:
+                continue
+            if None not in agents:
+                break
+            character.pending_reward = 0
+            agents[agents.index(None)] = character
+
+    def step(self, actions):
+        # actions: one Action index per agent; -1 lets the character's own Q-learning choose
+        world = self.world
+        rewards = self.rewards
+        rewards.fill(0)
+        self.dones.fill(False)
+
+        for i, character in enumerate(self.agents):
+            if character is None or character.action_state != "idle":
+                continue
+            choice = actions[i]
+            action = character.choose_action() if choice < 0 else ACTIONS[choice]
+            rewards[i] += world.start_action(character, action)
+
+        for _ in range(self.frames_per_step):
+            if world.game_over:
+                break
+            world.step()
+
+        for i, character in enumerate(self.agents):
+            if character is None:
+                continue
+            rewards[i] += character.pending_reward
+            character.pending_reward = 0
+            if character.is_dead:
+                rewards[i] += DEATH_PENALTY
+                self.dones[i] = True
+        self._sync_agents()
+
+        self.steps += 1
+        terminated = world.game_over
+        truncated = not terminated and self.steps >= self.max_steps
+        info = {"game_time": world.game_time, "population": len(world.characters)}
+        return self.observe(), rewards, terminated, truncated, info
+
+    def _fill_points(self, kind, positions):
+        # Copies (x, y) pairs into the preallocated buffer without building temporary arrays
+        points = self.points[kind]
+        for i, (x, y) in enumerate(positions):
+            points[i, 0] = x
+            points[i, 1] = y
+
+    def observe(self):
+        world = self.world
+        obs = self.obs
+        obs.fill(0)
+        width = world.width
+        height = world.height - world.game_area_start
+
+        for i, character in enumerate(self.agents):
+            if character is None:
+                continue
+            row = obs[i]
+            inventory = character.inventory
+            row[0] = 1.0
+            row[1] = character.x / width
+            row[2] = (character.y - world.game_area_start) / height
+            row[3] = character.hp / character.max_hp
+            row[4] = character.level
+            row[5] = inventory[Resource.WOOD]
+            row[6] = inventory[Resource.FOOD]
+            row[7] = inventory[Resource.HOUSE]
+            row[8] = character.action_state == "idle"
+            self.agent_xy[i, 0] = character.x
+            self.agent_xy[i, 1] = character.y
+
+        counts = {
+            "tree": len(world.tree_positions),
+            "food": len(world.food_positions),
+            "monster": len(world.monsters),
+            "house": len(world.houses),
+        }
+        needed = max(counts.values())
+        if needed > self.capacity:
+            self._grow(max(needed, self.capacity * 2))
+        self._fill_points("tree", world.tree_positions)
+        self._fill_points("food", world.food_positions)
+        self._fill_points("monster", ((m.x, m.y) for m in world.monsters))
+        self._fill_points("house", ((h.x, h.y) for h in world.houses))
+
+        diagonal = (width ** 2 + height ** 2) ** 0.5
+        for kind, column in NEAREST_COLUMNS.items():
+            self._nearest(self.points[kind], counts[kind], column, diagonal, width, height)
+
+        # Empty agent rows stay all zero
+        obs *= self.alive[:, None]
+        return obs
+
+    def _nearest(self, points, count, column, diagonal, width, height):
+        obs = self.obs
+        if count == 0:
+            obs[:, column] = 1.0  # Nothing there: as far away as possible
+            return
+        capacity = self.capacity
+        diff = self.diff[:, :count]
+        square = self.square[:, :count]
+        distance = self.distance[:, :count]
+        np.subtract(points[None, :count], self.agent_xy[:, None], out=diff)
+        np.multiply(diff, diff, out=square)
+        np.add(square[:, :, 0], square[:, :, 1], out=distance)
+        np.argmin(distance, axis=1, out=self.nearest)
+
+        # Gather the winners through flat indices so no fancy-indexing copies are made
+        index = self.index
+        np.multiply(self.rows, capacity, out=index)
+        np.add(index, self.nearest, out=index)
+        np.take(self.distance_flat, index, out=self.scratch)
+        np.sqrt(self.scratch, out=self.scratch)
+        np.divide(self.scratch, diagonal, out=obs[:, column])
+        np.multiply(index, 2, out=index)
+        np.take(self.diff_flat, index, out=self.scratch)
+        np.divide(self.scratch, width, out=obs[:, column + 1])
+        np.add(index, 1, out=index)
+        np.take(self.diff_flat, index, out=self.scratch)
+        np.divide(self.scratch, height, out=obs[:, column + 2])
+
+
+class VectorVillageEnv:
+    # K independent villages stepped together; every result is a stacked array.
+    # A village that ends is reset in place and its last observation is returned in info.
+    def __init__(self, num_envs, max_agents=8, roster_config=None, frames_per_step=60, max_steps=1000):
+        self.num_envs = num_envs
+        self.obs = np.zeros((num_envs, max_agents, len(FEATURES)), dtype=np.float32)
+        self.rewards = np.zeros((num_envs, max_agents), dtype=np.float32)
+        self.dones = np.zeros((num_envs, max_agents), dtype=bool)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        # Each village writes its observations straight into its slice of the stacked array
+        self.envs = [VillageEnv(max_agents, roster_config, frames_per_step, max_steps, out=self.obs[k])
+                     for k in range(num_envs)]
+        self.action_count = len(ACTIONS)
+        self.observation_shape = self.obs.shape
+        self.seed = None
+
+    def reset(self, seed=None):
+        self.seed = seed
+        for k, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + k)
+        return self.obs, {}
+
+    def step(self, actions):
+        final = {}
+        for k, env in enumerate(self.envs):
+            _, rewards, terminated, truncated, info = env.step(actions[k])
+            self.rewards[k] = rewards
+            self.dones[k] = env.dones
+            self.terminated[k] = terminated
+            self.truncated[k] = truncated
+            if terminated or truncated:
+                final[k] = (self.obs[k].copy(), info)
+                env.reset()
+        return self.obs, self.rewards, self.terminated, self.truncated, {"final": final}
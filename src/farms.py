@@ -0,0 +1,80 @@
+import copy
+import math
+from .buildings import Farm
+
+class FarmField:
+    def __init__(self, max_farms=30, merge_distance=30):
+        self.max_farms = max_farms
+        self.merge_distance = merge_distance
+        self.farms = []
+        self.cells = {}  # (cx, cy) -> farm, cells are merge_distance wide
+        self.version = 0  # Bumped whenever a farm is added
+
+    def __len__(self):
+        return len(self.farms)
+
+    def __iter__(self):
+        return iter(self.farms)
+
+    def _cell(self, x, y):
+        return int(x) // self.merge_distance, int(y) // self.merge_distance
+
+    def find(self, x, y, max_distance=None):
+        # Nearest farm within max_distance, looking only at the surrounding cells
+        if max_distance is None:
+            max_distance = self.merge_distance
+        cx, cy = self._cell(x, y)
+        reach = max(1, math.ceil(max_distance / self.merge_distance))
+        nearest, nearest_distance = None, max_distance
+        for dy in range(-reach, reach + 1):
+            for dx in range(-reach, reach + 1):
+                farm = self.cells.get((cx + dx, cy + dy))
+                if farm:
+                    distance = math.hypot(farm.x - x, farm.y - y)
+                    if distance <= nearest_distance:
+                        nearest, nearest_distance = farm, distance
+        return nearest
+
+    def nearest(self, x, y):
+        if not self.farms:
+            return None
+        return min(self.farms, key=lambda farm: (farm.x - x) ** 2 + (farm.y - y) ** 2)
+
+    def plant(self, x, y):
+        # Farming next to an existing farm adds a plot to it instead of a new entry
+        farm = self.find(x, y)
+        if farm is None and len(self.farms) >= self.max_farms:
+            farm = self.nearest(x, y)
+        if farm is not None:
+            farm.plots = min(farm.capacity, farm.plots + 1)
+            return farm
+
+        cell = self._cell(x, y)
+        if cell in self.cells:
+            # Cell taken by a farm just out of merge range; nudge into it anyway
+            farm = self.cells[cell]
+            farm.plots = min(farm.capacity, farm.plots + 1)
+            return farm
+
+        farm = Farm(x, y)
+        self.cells[cell] = farm
+        self.farms.append(farm)
+        self.version += 1
+        return farm
+
+    def snapshot(self):
+        # Copy for drawing on another thread; the cell index is left out
+        snapshot = copy.copy(self)
+        snapshot.farms = [copy.copy(farm) for farm in self.farms]
+        snapshot.cells = {}
+        return snapshot
+
+    def update(self):
+        ripe = []
+        for farm in self.farms:
+            if farm.dormant:
+                continue
+            farm.grow()
+            if farm.is_ripe():
+                ripe.append(farm)
+        return ripe
@@ -0,0 +1,128 @@
+import heapq
+import math
+
+UNREACHED = 1 << 30
+
+class FlowField:
+    def __init__(self, grid, max_distance=None):
+        self.grid = grid
+        # Cells further than this many steps from every character stay unreached; None covers the grid
+        self.max_distance = max_distance
+        # Per cell: steps to the nearest character and the cell that character stands in
+        self.distance = [UNREACHED] * grid.size
+        self.source = [-1] * grid.size
+        self.occupants = {}  # Cell index -> characters standing in it
+        self.grid_version = grid.version
+        self.rebuilds = 0
+        self.repairs = 0
+
+    def update(self, characters):
+        index = self.grid.index
+        occupants = {}
+        for character in characters:
+            occupants.setdefault(index(character.x, character.y), []).append(character)
+        previous = self.occupants
+        self.occupants = occupants
+
+        if self.grid_version != self.grid.version:
+            self.grid_version = self.grid.version
+            self.rebuild()
+            return
+
+        removed = [cell for cell in previous if cell not in occupants]
+        added = [cell for cell in occupants if cell not in previous]
+        if removed or added:
+            self.repair(removed, added)
+
+    def rebuild(self):
+        self.distance = [UNREACHED] * self.grid.size
+        self.source = [-1] * self.grid.size
+        self.rebuilds += 1
+        self._propagate([(0, cell, cell) for cell in self.occupants])
+
+    def repair(self, removed, added):
+        # Only the cells that were closest to a vacated cell need new distances
+        self.repairs += 1
+        distance, source, neighbours = self.distance, self.source, self.grid.neighbours
+        stale = []
+        for origin in removed:
+            if source[origin] != origin:
+                continue
+            stack = [origin]
+            source[origin] = -1
+            while stack:
+                cell = stack.pop()
+                distance[cell] = UNREACHED
+                stale.append(cell)
+                for n in neighbours[cell]:
+                    if source[n] == origin:
+                        source[n] = -1
+                        stack.append(n)
+
+        # Re-grow into the cleared region from its surviving border and any new sources
+        blocked = self.grid.blocked
+        seeds = [(0, cell, cell) for cell in added]
+        for cell in stale:
+            for n in neighbours[cell]:
+                if source[n] >= 0 and (not blocked[n] or distance[n] == 0):
+                    seeds.append((distance[n], n, source[n]))
+        self._propagate(seeds)
+
+    def _propagate(self, seeds):
+        distance, source = self.distance, self.source
+        blocked, neighbours = self.grid.blocked, self.grid.neighbours
+        heap = []
+        for d, cell, origin in seeds:
+            if d <= distance[cell]:
+                distance[cell] = d
+                source[cell] = origin
+                heap.append((d, cell, origin))
+        heapq.heapify(heap)
+        limit = UNREACHED if self.max_distance is None else self.max_distance
+
+        while heap:
+            d, cell, origin = heapq.heappop(heap)
+            if d > distance[cell] or source[cell] != origin:
+                continue
+            nd = d + 1
+            if nd > limit:
+                continue
+            for n in neighbours[cell]:
+                if nd < distance[n]:
+                    distance[n] = nd
+                    source[n] = origin
+                    # Houses get a distance so monsters can leave them, but paths never cross them
+                    if not blocked[n]:
+                        heapq.heappush(heap, (nd, n, origin))
+
+    def steer(self, x, y):
+        # Returns the point a monster at (x, y) should head for, or None if no path exists
+        cell = self.grid.index(x, y)
+        distance = self.distance
+        best = distance[cell]
+        if best >= UNREACHED:
+            return None
+        target = cell
+        blocked = self.grid.blocked
+        for n in self.grid.neighbours[cell]:
+            if distance[n] < best and (not blocked[n] or distance[n] == 0):
+                best = distance[n]
+                target = n
+        return self.grid.center(target)
+
+    def nearest_character(self, x, y):
+        cell = self.grid.index(x, y)
+        origin = self.source[cell]
+        if origin < 0:
+            return None
+        return min(self.occupants[origin], key=lambda c: (c.x - x) ** 2 + (c.y - y) ** 2)
+
+    def characters_near(self, x, y, radius):
+        occupants = self.occupants
+        if not occupants:
+            return
+        for cell in self.grid.cells_in_radius(x, y, radius):
+            if cell in occupants:
+                for character in occupants[cell]:
+                    if math.hypot(character.x - x, character.y - y) <= radius:
+                        yield character
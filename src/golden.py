@@ -0,0 +1,165 @@
+import gzip
+import hashlib
+import json
+import random
+from .world import World
+from .roster import Roster
+from .difficulty import ScheduledDifficulty
+
+# Fixed-seed scenarios; each one is replayed exactly the same way against every engine
+SCENARIOS = {
+    "classic": {"seed": 1, "size": 3, "frames": 3600, "ramp": False},
+    "crowd": {"seed": 2, "size": 12, "frames": 3600, "ramp": False},
+    "siege": {"seed": 3, "size": 6, "frames": 3600, "ramp": True},
+}
+
+
+def round_floats(value, precision):
+    if isinstance(value, float):
+        return round(value, precision)
+    if isinstance(value, (list, tuple)):
+        return [round_floats(item, precision) for item in value]
+    if isinstance(value, dict):
+        return {key: round_floats(item, precision) for key, item in value.items()}
+    return value
+
+
+def character_state(character):
+    return {
+        "x": character.x, "y": character.y, "hp": character.hp, "max_hp": character.max_hp,
+        "level": character.level, "exp": character.exp,
+        "inventory": [character.inventory[key] for key in sorted(character.inventory, key=lambda r: r.value)],
+        "action_state": character.action_state,
+        "current_action": character.current_action.value if character.current_action else None,
+        "current_target": character.current_target,
+        "q_table": [character.q_table[key] for key in sorted(character.q_table, key=lambda a: a.value)],
+        "epsilon": character.epsilon,
+        "attack_cooldown": character.current_attack_cooldown,
+    }
+
+
+def world_state(world, precision=6):
+    # Field name -> plain value; characters get one field each so divergences name who changed
+    fields = {
+        "world": {
+            "game_time": world.game_time,
+            "game_over": world.game_over,
+            "resources": [world.resources[key] for key in sorted(world.resources, key=lambda r: r.value)],
+        },
+        "trees": sorted(world.tree_positions),
+        "food": sorted(world.food_positions),
+        "houses": [(house.x, house.y, house.level) for house in world.houses],
+        "farms": sorted((farm.x, farm.y, farm.plots, farm.growth) for farm in world.farms),
+        "monsters": [(m.x, m.y, m.hp, m.level, m.current_cooldown) for m in world.monsters],
+    }
+    for character in world.characters:
+        fields[f"character:{character.name}"] = character_state(character)
+    return round_floats(fields, precision)
+
+
+def digest(value):
+    return hashlib.blake2b(json.dumps(value, sort_keys=True, default=str).encode(),
+                           digest_size=8).hexdigest()
+
+
+class TraceRun:
+    # Steps one engine through a scenario, yielding (tick, fields, events) after every frame
+    def __init__(self, scenario, engine=World, precision=6):
+        self.scenario = SCENARIOS[scenario] if isinstance(scenario, str) else scenario
+        self.engine = engine
+        self.precision = precision
+        self.events = []
+
+    def setup(self):
+        scenario = self.scenario
+        random.seed(scenario["seed"])
+        world = self.engine()
+        world.log_actions = False
+        if scenario["ramp"]:
+            world.difficulty = ScheduledDifficulty.ramp(scenario["frames"], interval=120, seed=scenario["seed"])
+        world.populate(Roster(size=scenario["size"], seed=scenario["seed"]))
+
+        # Record events by wrapping the world's own entry points on this instance only
+        add_effect = world.add_effect
+        start_action = world.start_action
+
+        def record_effect(text, x, y, color, anchor=None):
+            self.events.append(["effect", text, x, y])
+            return add_effect(text, x, y, color, anchor)
+
+        def record_action(character, action):
+            reward = start_action(character, action)
+            self.events.append(["action", character.name, action.value, reward])
+            return reward
+
+        world.add_effect = record_effect
+        world.start_action = record_action
+        return world
+
+    def __iter__(self):
+        world = self.setup()
+        for tick in range(self.scenario["frames"]):
+            if world.game_over:
+                break
+            self.events = []
+            world.step()
+            yield tick, world_state(world, self.precision), round_floats(self.events, self.precision)
+
+
+def record(scenario, engine=World, precision=6):
+    # Per tick: one hash per field plus one for the events of that tick
+    ticks = []
+    for tick, fields, events in TraceRun(scenario, engine, precision):
+        hashes = {name: digest(value) for name, value in fields.items()}
+        hashes["events"] = digest(events)
+        ticks.append(hashes)
+    return {"scenario": scenario, "precision": precision, "ticks": ticks}
+
+
+def save(trace, path):
+    with gzip.open(path, "wt") as f:
+        json.dump(trace, f)
+
+
+def load(path):
+    with gzip.open(path, "rt") as f:
+        return json.load(f)
+
+
+def compare(trace, engine, reference=None):
+    # Replays the trace's scenario on engine. Returns None when every tick matches, otherwise
+    # the first diverging tick and field, with both values if a reference engine is given.
+    scenario = trace["scenario"]
+    precision = trace["precision"]
+    expected_ticks = trace["ticks"]
+    last = -1
+    for tick, fields, events in TraceRun(scenario, engine, precision):
+        last = tick
+        if tick >= len(expected_ticks):
+            return {"tick": tick, "field": "length", "message": "candidate runs longer than the reference"}
+        expected = expected_ticks[tick]
+        hashes = {name: digest(value) for name, value in fields.items()}
+        hashes["events"] = digest(events)
+        if hashes == expected:
+            continue
+        names = sorted(set(expected) | set(hashes))
+        field = next(name for name in names if expected.get(name) != hashes.get(name))
+        candidate = events if field == "events" else fields.get(field)
+        report = {"tick": tick, "field": field, "candidate": candidate}
+        if reference is not None:
+            report["reference"] = value_at(scenario, reference, precision, tick, field)
+            if isinstance(candidate, dict) and isinstance(report["reference"], dict):
+                report["differences"] = {key: [report["reference"].get(key), candidate.get(key)]
+                                         for key in sorted(set(candidate) | set(report["reference"]))
+                                         if candidate.get(key) != report["reference"].get(key)}
+        return report
+    if last + 1 < len(expected_ticks):
+        return {"tick": last + 1, "field": "length", "message": "candidate ended before the reference"}
+    return None
+
+
+def value_at(scenario, engine, precision, tick, field):
+    for current, fields, events in TraceRun(scenario, engine, precision):
+        if current == tick:
+            return events if field == "events" else fields.get(field)
+    return None
@@ -0,0 +1,70 @@
+import time
+
+# Render quality levels, cheapest last; each one keeps the savings of those before it
+FULL = 0
+NO_EFFECTS = 1  # Floating text is not drawn
+NO_TOOLTIPS = 2  # Hovering houses and farms shows nothing
+PLAIN_MONSTERS = 3  # Monsters without their level text
+HALF_RATE = 4  # A new frame is drawn every other displayed frame
+QUALITY_NAMES = ("full", "no effects", "no tooltips", "plain monsters", "half rate")
+
+
+class FrameGovernor:
+    # Watches how long simulation ticks and drawing take and lowers the render quality one
+    # level at a time while frames run over budget, raising it again once there is headroom.
+    # Only drawing is degraded; the simulation always runs every tick game_speed asks for.
+    def __init__(self, fps=60, headroom=0.75, patience=30, smoothing=0.1):
+        self.budget = 1.0 / fps
+        self.headroom = headroom  # Quality goes back up below this fraction of the budget
+        self.patience = patience  # Frames over (or under) budget before changing level
+        self.smoothing = smoothing
+        self.level = FULL
+        self.tick_time = 0.0  # Smoothed seconds spent stepping the world per frame
+        self.draw_time = 0.0  # Smoothed seconds the renderer needs per frame
+        self.frame_time = 0.0  # The larger of the two, compared against the budget
+        self.over = 0
+        self.under = 0
+        self.frame = 0
+        self.tick_start = None
+
+    def start_ticks(self):
+        self.tick_start = time.perf_counter()
+
+    def end_ticks(self):
+        elapsed = time.perf_counter() - self.tick_start
+        self.tick_time += (elapsed - self.tick_time) * self.smoothing
+
+    def record_draw(self, seconds):
+        self.draw_time += (seconds - self.draw_time) * self.smoothing
+
+    def update(self):
+        # Called once per displayed frame, after the ticks
+        self.frame += 1
+        # Ticks and drawing run on different threads, so the slower one sets the frame time
+        self.frame_time = max(self.tick_time, self.draw_time)
+        if self.frame_time > self.budget:
+            self.over += 1
+            self.under = 0
+            if self.over >= self.patience and self.level < HALF_RATE:
+                self.level += 1
+                self.over = 0
+        elif self.frame_time < self.budget * self.headroom:
+            self.under += 1
+            self.over = 0
+            if self.under >= self.patience and self.level > FULL:
+                self.level -= 1
+                self.under = 0
+        else:
+            self.over = self.under = 0
+        return self.level
+
+    def should_draw(self):
+        # At HALF_RATE only every other frame is published to the renderer
+        return self.level < HALF_RATE or self.frame % 2 == 0
+
+    @property
+    def quality_name(self):
+        return QUALITY_NAMES[self.level]
+
+    def status(self):
+        return f"Q{self.level} {self.frame_time * 1000:.1f}ms"
@@ -0,0 +1,54 @@
+class Grid:
+    def __init__(self, width, height, cell_size, top=0):
+        self.cell_size = cell_size
+        self.top = top
+        self.cols = -(-width // cell_size)
+        self.rows = -(-(height - top) // cell_size)
+        self.size = self.cols * self.rows
+        # Cells that block movement (houses); version bumps on every change
+        self.blocked = bytearray(self.size)
+        self.version = 0
+        self.neighbours = [self._neighbours(i) for i in range(self.size)]
+
+    def _neighbours(self, index):
+        cx, cy = index % self.cols, index // self.cols
+        result = []
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < self.cols and 0 <= ny < self.rows:
+                    result.append(ny * self.cols + nx)
+        return tuple(result)
+
+    def cell_of(self, x, y):
+        cx = min(self.cols - 1, max(0, int(x) // self.cell_size))
+        cy = min(self.rows - 1, max(0, (int(y) - self.top) // self.cell_size))
+        return cx, cy
+
+    def index(self, x, y):
+        cx = int(x) // self.cell_size
+        cy = (int(y) - self.top) // self.cell_size
+        if 0 <= cx < self.cols and 0 <= cy < self.rows:
+            return cy * self.cols + cx
+        cx, cy = self.cell_of(x, y)
+        return cy * self.cols + cx
+
+    def center(self, index):
+        half = self.cell_size / 2
+        return ((index % self.cols) * self.cell_size + half,
+                (index // self.cols) * self.cell_size + self.top + half)
+
+    def cells_in_rect(self, left, top, right, bottom):
+        x0, y0 = self.cell_of(left, top)
+        x1, y1 = self.cell_of(right, bottom)
+        return [cy * self.cols + cx for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)]
+
+    def cells_in_radius(self, x, y, radius):
+        return self.cells_in_rect(x - radius, y - radius, x + radius, y + radius)
+
+    def block_rect(self, left, top, right, bottom):
+        for index in self.cells_in_rect(left, top, right, bottom):
+            self.blocked[index] = 1
+        self.version += 1
@@ -0,0 +1,230 @@
+import argparse
+import operator
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from .enums import Resource, Action
+
+LAYOUT_VERSION = 1
+# header[0] is the seqlock sequence: odd while a tick is being written, even when stable
+SEQUENCE, VERSION, MAX_CHARACTERS, MAX_MONSTERS, ACTION_COUNT = range(5)
+HEADER_SIZE = 8
+WORLD_FIELDS = ("game_time", "characters", "monsters", "wood", "food", "trees", "food_sources",
+                "houses", "farms", "monster_level", "game_over")
+ACTIONS = list(Action)
+RESOURCES = list(Resource)
+
+
+# Per-row columns of the characters and monsters tables, all float32
+CHARACTER_FIELDS = (("x", "y", "hp", "max_hp", "level")
+                    + tuple(f"inventory.{resource.value}" for resource in RESOURCES)
+                    + tuple(f"q.{action.value}" for action in ACTIONS))
+MONSTER_FIELDS = ("x", "y", "hp", "level")
+
+
+def layout(max_characters, max_monsters):
+    # name -> (dtype, shape), in memory order; wider types first keeps every field aligned
+    return {
+        "header": ("int64", (HEADER_SIZE,)),
+        "world": ("int64", (len(WORLD_FIELDS),)),
+        "characters": ("float32", (max_characters, len(CHARACTER_FIELDS))),
+        "monsters": ("float32", (max_monsters, len(MONSTER_FIELDS))),
+        "name": ("S16", (max_characters,)),
+        "action": ("int8", (max_characters,)),  # Index into ACTIONS, -1 for none
+    }
+
+
+def map_views(columns, buffer):
+    # NumPy views over one buffer, nothing is copied. Table columns get views of their own,
+    # e.g. views["hp"], views["inventory"] (one column per resource) and views["q_table"].
+    views = {}
+    offset = 0
+    for name, (dtype, shape) in columns.items():
+        views[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += views[name].nbytes
+    characters, monsters = views["characters"], views["monsters"]
+    for i, name in enumerate(("x", "y", "hp", "max_hp", "level")):
+        views[name] = characters[:, i]
+    views["inventory"] = characters[:, 5:5 + len(RESOURCES)]
+    views["q_table"] = characters[:, 5 + len(RESOURCES):]
+    for i, name in enumerate(MONSTER_FIELDS):
+        views[f"monster_{name}"] = monsters[:, i]
+    return views
+
+
+def attach(name):
+    # Only the writer may unlink the block; a reader's resource tracker would do it on exit
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def block_size(columns):
+    return sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for dtype, shape in columns.values())
+
+
+class LiveStateWriter:
+    # Publishes the village into a fixed-layout shared memory block once per tick, for dashboards
+    # in other processes. Single writer; readers retry while the sequence is odd or has moved.
+    def __init__(self, name="village_state", max_characters=64, max_monsters=64):
+        self.max_characters = max_characters
+        self.max_monsters = max_monsters
+        self.columns = layout(max_characters, max_monsters)
+        self.size = block_size(self.columns)
+        try:
+            self.memory = shared_memory.SharedMemory(name=name, create=True, size=self.size)
+        except FileExistsError:
+            # Left behind by a run that did not exit cleanly
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.memory = shared_memory.SharedMemory(name=name, create=True, size=self.size)
+        self.views = map_views(self.columns, self.memory.buf)
+        for name in self.columns:
+            self.views[name].fill(0)
+        header = self.views["header"]
+        header[VERSION] = LAYOUT_VERSION
+        header[MAX_CHARACTERS] = max_characters
+        header[MAX_MONSTERS] = max_monsters
+        header[ACTION_COUNT] = len(ACTIONS)
+        self.action_index = {action: i for i, action in enumerate(ACTIONS)}
+        self.inventory_of = operator.itemgetter(*RESOURCES)
+        self.q_values_of = operator.itemgetter(*ACTIONS)
+        self.dropped_characters = 0
+        self.dropped_monsters = 0
+        self.named = []  # Characters whose names are in the block, row by row
+
+        # Overhead accounting
+        self.publishes = 0
+        self.publish_time = 0.0
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def publish(self, world):
+        start = time.perf_counter()
+        v = self.views
+        header = v["header"]
+        header[SEQUENCE] += 1  # Odd: readers wait or retry
+
+        characters = world.characters[:self.max_characters]
+        monsters = world.monsters[:self.max_monsters]
+        self.dropped_characters = len(world.characters) - len(characters)
+        self.dropped_monsters = len(world.monsters) - len(monsters)
+        v["world"][:] = (
+            world.game_time, len(characters), len(monsters),
+            world.resources[Resource.WOOD], world.resources[Resource.FOOD],
+            len(world.tree_positions), len(world.food_positions), len(world.houses), len(world.farms),
+            max((monster.level for monster in world.monsters), default=0), world.game_over,
+        )
+        n = len(characters)
+        if n:
+            # One row per character converts in a single call, far cheaper than a call per column
+            inventory_of, q_values_of = self.inventory_of, self.q_values_of
+            v["characters"][:n] = [
+                (c.x, c.y, c.hp, c.max_hp, c.level, *inventory_of(c.inventory), *q_values_of(c.q_table))
+                for c in characters
+            ]
+            action_index = self.action_index
+            v["action"][:n] = [action_index.get(c.current_action, -1) for c in characters]
+            if characters != self.named:
+                v["name"][:n] = [c.name.encode()[:16] for c in characters]
+                self.named = characters
+        if monsters:
+            v["monsters"][:len(monsters)] = [(m.x, m.y, m.hp, m.level) for m in monsters]
+
+        header[SEQUENCE] += 1  # Even again: this tick is complete
+        self.publishes += 1
+        self.publish_time += time.perf_counter() - start
+
+    def close(self):
+        # Views must go before the block can be closed; readers keep their own mapping
+        self.views = None
+        self.memory.close()
+        self.memory.unlink()
+
+
+class LiveStateReader:
+    # Attaches to a writer's block by name. views are zero-copy and may change under you;
+    # read() returns a consistent tick, copied into a private buffer with the same layout.
+    def __init__(self, name="village_state"):
+        self.memory = attach(name)
+        header = np.ndarray((HEADER_SIZE,), dtype=np.int64, buffer=self.memory.buf)
+        if header[VERSION] != LAYOUT_VERSION:
+            raise ValueError(f"Live state layout {header[VERSION]} is not {LAYOUT_VERSION}")
+        if header[ACTION_COUNT] != len(ACTIONS):
+            raise ValueError(f"Live state has {header[ACTION_COUNT]} actions, expected {len(ACTIONS)}")
+        self.columns = layout(int(header[MAX_CHARACTERS]), int(header[MAX_MONSTERS]))
+        self.size = block_size(self.columns)
+        del header
+        self.views = map_views(self.columns, self.memory.buf)
+        self.copy = bytearray(self.size)
+        self.state = map_views(self.columns, self.copy)
+        self.retries = 0
+
+    @property
+    def sequence(self):
+        return int(self.views["header"][SEQUENCE])
+
+    def read(self, timeout=1.0):
+        # Copy the whole block, keep it only if no write started or finished meanwhile
+        header = self.views["header"]
+        source = self.memory.buf[:self.size]
+        deadline = None
+        while True:
+            before = int(header[SEQUENCE])
+            if not before & 1:
+                self.copy[:] = source
+                if int(header[SEQUENCE]) == before:
+                    return self.state
+            self.retries += 1
+            if deadline is None:
+                deadline = time.perf_counter() + timeout
+            elif time.perf_counter() > deadline:
+                raise TimeoutError("Live state writer did not finish a tick in time")
+            time.sleep(0)
+
+    def world(self, state=None):
+        state = self.read() if state is None else state
+        return dict(zip(WORLD_FIELDS, (int(value) for value in state["world"])))
+
+    def close(self):
+        self.views = None
+        self.memory.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the live state of a running village")
+    parser.add_argument("--name", default="village_state")
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    reader = LiveStateReader(args.name)
+    try:
+        while True:
+            state = reader.read()
+            world = reader.world(state)
+            n = world["characters"]
+            names = [name.decode() for name in state["name"][:n]]
+            hp = ", ".join(f"{name} {hp:.0f}" for name, hp in zip(names, state["hp"][:n]))
+            print(f"t={world['game_time']} wood={world['wood']} food={world['food']} "
+                  f"monsters={world['monsters']} | {hp}")
+            if world["game_over"]:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import math
+
+class LevelOfDetail:
+    # Monsters and farms far from every character, and outside the view, drop out of the
+    # per-frame update. Every interval frames they are reclassified and the dormant ones
+    # advance in bulk: monsters drift along the flow field, farms grow by the whole interval.
+    # Anything a character comes within active_distance of is promoted back to full detail.
+    # The flow field is cut off at field_distance, so its cost follows the characters rather
+    # than the size of the world; beyond it dormant monsters head straight for the nearest one.
+    def __init__(self, active_distance=6, interval=30, view=None, field_distance=12):
+        self.active_distance = active_distance  # Flow-field steps (grid cells) from the nearest character
+        self.field_distance = max(field_distance, active_distance)
+        self.interval = interval
+        self.view = view  # (left, top, right, bottom) always kept at full detail, e.g. the visible area
+        self.timer = 0
+        self.promotions = 0
+        self.demotions = 0
+
+    def in_view(self, x, y):
+        view = self.view
+        return view is not None and view[0] <= x <= view[2] and view[1] <= y <= view[3]
+
+    def is_active(self, world, x, y):
+        if self.in_view(x, y):
+            return True
+        return world.flow_field.distance[world.grid.index(x, y)] <= self.active_distance
+
+    def update(self, world):
+        # Called once per frame after the flow field is updated
+        flow_field = world.flow_field
+        if flow_field.max_distance != self.field_distance:
+            flow_field.max_distance = self.field_distance
+            flow_field.rebuild()
+        self.timer += 1
+        if self.timer < self.interval:
+            return
+        self.timer = 0
+        for monster in world.monsters:
+            if monster.dormant:
+                self.drift(world, monster)
+            self.classify(world, monster)
+        for farm in world.farms:
+            if farm.dormant:
+                farm.grow(self.interval)
+            self.classify(world, farm)
+
+    def classify(self, world, entity):
+        dormant = not self.is_active(world, entity.x, entity.y)
+        if dormant != entity.dormant:
+            entity.dormant = dormant
+            if dormant:
+                self.demotions += 1
+            else:
+                self.promotions += 1
+
+    def drift(self, world, monster):
+        # interval frames of walking in one go, waypoint to waypoint, stopping once in range of a character
+        flow_field = world.flow_field
+        budget = monster.speed * self.interval
+        while budget > 0:
+            waypoint = flow_field.steer(monster.x, monster.y)
+            if waypoint is None:
+                character = self.nearest_character(world, monster)
+                if character is None:
+                    return
+                waypoint = (character.x, character.y)
+            dx = waypoint[0] - monster.x
+            dy = waypoint[1] - monster.y
+            distance = math.sqrt(dx**2 + dy**2)
+            if distance <= budget:
+                if distance == 0:
+                    return  # Already at the end of the field
+                monster.x, monster.y = waypoint
+                budget -= distance
+            else:
+                monster.x += dx / distance * budget
+                monster.y += dy / distance * budget
+                budget = 0
+            if self.is_active(world, monster.x, monster.y):
+                return
+
+    def nearest_character(self, world, monster):
+        # Outside the flow field: the closest character in a straight line
+        best, best_distance = None, float('inf')
+        for character in world.characters:
+            distance = (character.x - monster.x) ** 2 + (character.y - monster.y) ** 2
+            if distance < best_distance:
+                best, best_distance = character, distance
+        return best
+
+    def counts(self, world):
+        monsters = sum(1 for monster in world.monsters if monster.dormant)
+        farms = sum(1 for farm in world.farms if farm.dormant)
+        return {
+            "active_monsters": len(world.monsters) - monsters,
+            "dormant_monsters": monsters,
+            "active_farms": len(world.farms) - farms,
+            "dormant_farms": farms,
+        }
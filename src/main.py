@@ -1,22 +1,13 @@
+import contextlib
+import os
 import pygame
 from src.world import World
-from src.character import Character
 from src.enums import Resource
-from src.animation import Animation
-
-# Define the take_screenshot function directly in main.py instead of importing it
-def take_screenshot(screen):
-    import datetime
-    import os
-    
-    # Create screenshots directory if it doesn't exist
-    if not os.path.exists("screenshots"):
-        os.makedirs("screenshots")
-        
-    timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-    filename = f"screenshots/screenshot-{timestamp}.png"
-    pygame.image.save(screen, filename)
-    print(f"Screenshot saved as {filename}")
+from src.render_pipeline import RenderPipeline
+from src.memtrack import MemoryTracker
+from src.capture import FrameCapture
+from src.governor import FrameGovernor
+from src.livestate import LiveStateWriter
 
 def draw_instruction_screen(screen):
     overlay = pygame.Surface((800, 700))
@@ -87,113 +78,123 @@ def main():
     start_button = None
     
     world = World()
+    world.populate()
+    renderer = world.get_renderer()
+    
+    # VILLAGE_TRACK_MEMORY=1 attributes allocations to each loop, step and draw phase
+    memory = None
+    if os.environ.get("VILLAGE_TRACK_MEMORY"):
+        memory = MemoryTracker()
+        memory.start()
+        world.memory = memory
+        memory.instrument(renderer, ("draw", "draw_ui", "draw_effect", "draw_help_button",
+                                     "draw_help_overlay"), "renderer.")
+    phase = memory.phase if memory else lambda name: contextlib.nullcontext()
+    
+    # VILLAGE_LIVE_STATE=<name> shares every tick in a shared memory block for dashboards
+    if os.environ.get("VILLAGE_LIVE_STATE"):
+        world.live_state = LiveStateWriter(os.environ["VILLAGE_LIVE_STATE"])
     
-    characters = [
-        Character("Alice", 200, 400),
-        Character("Bob", 400, 400),
-        Character("Charlie", 600, 400)
-    ]
-    
-    characters[0].color = (100, 255, 100)  # Green for Alice
-    characters[1].color = (255, 100, 100)  # Red for Bob
-    characters[2].color = (100, 100, 255)  # Blue for Charlie
+    running = True
     
-    for character in characters:
-        world.add_character(character)
+    # Screenshots and timelapse frames are encoded on background threads
+    capture = FrameCapture()
     
-    running = True
-    frame_count = 0
+    # Draw on a separate thread so simulation ticks overlap with rendering. Memory tracking reads
+    # global counters, so while it runs frames are drawn on this thread, between the ticks.
+    pipeline = RenderPipeline(screen.get_size(), threaded=memory is None)
+    pipeline.start()
     
     # Initialize base clock
     clock = pygame.time.Clock()
     base_fps = 60
     
+    # Drops drawing detail, never simulation ticks, when frames run over budget
+    governor = FrameGovernor(base_fps)
+    
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+        with phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    mouse_pos = pygame.mouse.get_pos()
                 
-                if world.help_button.collidepoint(mouse_pos):
-                    # Toggle help overlay and pause state
-                    world.show_help = not world.show_help
-                    world.paused = world.show_help
-                    world.help_page = 1  # Reset to first page when opening
-                elif world.show_help:
-                    # Click anywhere to close help and unpause
-                    world.show_help = False
-                    world.paused = False
-                elif show_instructions:
-                    # Check if start button is clicked
-                    if start_button.collidepoint(mouse_pos):
-                        show_instructions = False
-                else:
-                    world.handle_mouse_event(event)
-            elif event.type in (pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
-                if not show_instructions:
-                    world.handle_mouse_event(event)
-            elif event.type == pygame.KEYDOWN:
-                if world.show_help:
-                    if event.key == pygame.K_LEFT:
-                        world.help_page = max(1, world.help_page - 1)
-                    elif event.key == pygame.K_RIGHT:
-                        world.help_page = min(world.total_help_pages, world.help_page + 1)
-                elif event.key == pygame.K_F12:  # F12 key for screenshot
-                    take_screenshot(screen)
-                elif not show_instructions:
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    if mouse_y > world.game_area_start:
-                        if event.key == pygame.K_1:
-                            world.tree_positions.append((mouse_x, mouse_y))
-                            world.resources[Resource.WOOD] += 1
-                            world.animations.append(
-                                Animation("Tree Planted!", mouse_x, mouse_y, (0, 255, 0)))
-                        elif event.key == pygame.K_2:
-                            world.food_positions.append((mouse_x, mouse_y))
-                            world.resources[Resource.FOOD] += 1
-                            world.animations.append(
-                                Animation("Food Planted!", mouse_x, mouse_y, (255, 255, 0)))
+                    if renderer.help_button.collidepoint(mouse_pos):
+                        # Toggle help overlay and pause state
+                        world.show_help = not world.show_help
+                        world.paused = world.show_help
+                        world.help_page = 1  # Reset to first page when opening
+                    elif world.show_help:
+                        # Click anywhere to close help and unpause
+                        world.show_help = False
+                        world.paused = False
+                    elif show_instructions:
+                        # Check if start button is clicked
+                        if start_button.collidepoint(mouse_pos):
+                            show_instructions = False
+                    else:
+                        renderer.handle_mouse_event(world, event)
+                elif event.type in (pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
+                    if not show_instructions:
+                        renderer.handle_mouse_event(world, event)
+                elif event.type == pygame.KEYDOWN:
+                    if world.show_help:
+                        if event.key == pygame.K_LEFT:
+                            world.help_page = max(1, world.help_page - 1)
+                        elif event.key == pygame.K_RIGHT:
+                            world.help_page = min(world.total_help_pages, world.help_page + 1)
+                    elif event.key == pygame.K_F12:  # F12 key for screenshot
+                        capture.screenshot(screen)
+                    elif event.key == pygame.K_F11:  # F11 starts or stops a timelapse recording
+                        capture.toggle_sequence()
+                    elif not show_instructions:
+                        mouse_x, mouse_y = pygame.mouse.get_pos()
+                        if mouse_y > world.game_area_start:
+                            if event.key == pygame.K_1:
+                                world.tree_positions.append((mouse_x, mouse_y))
+                                world.resources[Resource.WOOD] += 1
+                                world.add_effect("Tree Planted!", mouse_x, mouse_y, (0, 255, 0))
+                            elif event.key == pygame.K_2:
+                                world.food_positions.append((mouse_x, mouse_y))
+                                world.resources[Resource.FOOD] += 1
+                                world.add_effect("Food Planted!", mouse_x, mouse_y, (255, 255, 0))
         
         if show_instructions:
-            screen.fill((50, 100, 50))
-            world.draw(screen)
-            start_button = draw_instruction_screen(screen)
+            with phase("instructions"):
+                screen.fill((50, 100, 50))
+                world.draw(screen)
+                start_button = draw_instruction_screen(screen)
         else:
             # Only process game updates if not game over and not paused
+            governor.start_ticks()
             if not world.game_over and not world.paused:
                 # Process multiple frames based on game speed
                 for _ in range(world.game_speed):
-                    for character in characters[:]:
-                        character.update_needs()
-                        if character.is_dead:
-                            world.animations.append(
-                                Animation(f"{character.name} has died!", character.x, character.y, (255, 0, 0)))
-                            characters.remove(character)
-                    
-                    world.check_game_over()  # Check if game is over
-                    world.regenerate_resources()
-                    
-                    if frame_count % 60 == 0:
-                        for character in characters:
-                            if character.action_state == "idle":
-                                action = character.choose_action()
-                                reward = world.perform_action(character, action)
-                                print(f"{character.name} performed {action.value}, got reward: {reward}")
-                    else:
-                        for character in characters:
-                            if character.current_action:
-                                world.perform_action(character, character.current_action)
-                    
-                    world.update_characters()
-                    world.update_monsters()
-                    world.update_game_time()
-                    frame_count += 1
+                    world.step()
+            governor.end_ticks()
+            
+            governor.record_draw(pipeline.draw_time)
+            renderer.quality = governor.update()
+            renderer.frame_status = governor.status()
             
-            screen.fill((50, 100, 50))
-            world.draw(screen)
+            # Hand this frame to the render thread and show the last finished one
+            if governor.should_draw():
+                with phase("publish"):
+                    pipeline.publish(world)
+            with phase("present"):
+                pipeline.present(screen)
         
-        pygame.display.flip()
+        capture.on_frame(screen)
+        with phase("flip"):
+            pygame.display.flip()
         clock.tick(base_fps)
     
+    pipeline.stop()
+    capture.close()
+    if world.live_state:
+        world.live_state.close()
+    if memory:
+        print(memory.format_report())
+        memory.stop()
     pygame.quit()
\ No newline at end of file
@@ -0,0 +1,141 @@
+import contextlib
+import sys
+import threading
+import tracemalloc
+
+class MemoryTracker:
+    # Optional tracemalloc instrumentation: net objects and bytes per phase, and retained memory
+    # over time. Phases measure global counters, so they assume one thread allocates at a time.
+    def __init__(self, sample_every=60, traceback_frames=1):
+        self.sample_every = sample_every
+        self.traceback_frames = traceback_frames
+        self.phases = {}  # name -> [calls, net blocks, net bytes, largest transient peak]
+        self.samples = []  # (tick, traced bytes, allocated blocks)
+        self.ticks = 0
+        self.local = threading.local()  # Phase nesting depth, per thread
+        self.started_tracing = False
+        self.overhead = (0.0, 0.0)  # Blocks and bytes the measurement itself adds per phase
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+            self.started_tracing = True
+        self.calibrate()
+        self.sample()
+
+    def calibrate(self, calls=1000):
+        # Time an empty phase so reports show only what the measured code allocates
+        self.overhead = (0.0, 0.0)
+        for _ in range(calls):
+            with self.phase("calibration"):
+                pass
+        _, blocks, net_bytes, _ = self.phases.pop("calibration")
+        self.overhead = (blocks / calls, net_bytes / calls)
+
+    def stop(self):
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        blocks = sys.getallocatedblocks()
+        before = tracemalloc.get_traced_memory()[0]
+        depth = getattr(self.local, "depth", 0)
+        outermost = depth == 0
+        if outermost:
+            # Peaks are only measured for outermost phases, nested ones would reset them
+            tracemalloc.reset_peak()
+        self.local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self.local.depth = depth
+            after, peak = tracemalloc.get_traced_memory()
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = [0, 0, 0, 0]
+            stats[0] += 1
+            stats[1] += sys.getallocatedblocks() - blocks
+            stats[2] += after - before
+            if outermost:
+                stats[3] = max(stats[3], peak - before)
+
+    def instrument(self, obj, names, prefix=""):
+        # Replace methods on this instance with wrappers that run inside a phase
+        for name in names:
+            method = getattr(obj, name)
+            setattr(obj, name, self.wrap(prefix + name, method))
+
+    def wrap(self, name, function):
+        def tracked(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+        return tracked
+
+    def step(self, world):
+        # World.step with every phase measured separately
+        for name in world.step_phases:
+            with self.phase(name):
+                getattr(world, name)()
+        self.tick()
+
+    def tick(self):
+        self.ticks += 1
+        if self.ticks % self.sample_every == 0:
+            self.sample()
+
+    def sample(self):
+        self.samples.append((self.ticks, tracemalloc.get_traced_memory()[0], sys.getallocatedblocks()))
+
+    def slope(self, warmup=0.2, column=1):
+        # Least-squares growth per tick, ignoring the first warmup fraction of the samples
+        samples = self.samples[int(len(self.samples) * warmup):]
+        if len(samples) < 2:
+            return 0.0
+        xs = [sample[0] for sample in samples]
+        ys = [sample[column] for sample in samples]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        variance = sum((x - mean_x) ** 2 for x in xs)
+        if not variance:
+            return 0.0
+        return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+    def report(self, warmup=0.2):
+        ticks = max(1, self.ticks)
+        overhead_blocks, overhead_bytes = self.overhead
+        return {
+            "ticks": self.ticks,
+            "traced_bytes": self.samples[-1][1] if self.samples else 0,
+            "bytes_per_tick": self.slope(warmup, 1),
+            "objects_per_tick": self.slope(warmup, 2),
+            "phases": {
+                name: {
+                    "calls": calls,
+                    "objects_per_tick": (blocks - calls * overhead_blocks) / ticks,
+                    "bytes_per_tick": (net_bytes - calls * overhead_bytes) / ticks,
+                    "peak_bytes": peak,
+                }
+                for name, (calls, blocks, net_bytes, peak) in self.phases.items()
+            },
+        }
+
+    def format_report(self, warmup=0.2):
+        report = self.report(warmup)
+        lines = [f"{report['ticks']} ticks, {report['traced_bytes'] / 1024:.1f} KiB traced, "
+                 f"growth {report['bytes_per_tick']:.1f} B/tick, {report['objects_per_tick']:.3f} objects/tick",
+                 f"{'phase':<28}{'calls':>8}{'objects/tick':>14}{'bytes/tick':>12}{'peak KiB':>10}"]
+        phases = sorted(report["phases"].items(), key=lambda item: -abs(item[1]["bytes_per_tick"]))
+        for name, stats in phases:
+            lines.append(f"{name:<28}{stats['calls']:>8}{stats['objects_per_tick']:>14.3f}"
+                         f"{stats['bytes_per_tick']:>12.1f}{stats['peak_bytes'] / 1024:>10.1f}")
+        return "\n".join(lines)
+
+    def top(self, limit=10):
+        # Source lines holding the most traced memory right now
+        statistics = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]).statistics("lineno")
+        return [str(stat) for stat in statistics[:limit]]
@@ -0,0 +1,173 @@
+import json
+import os
+import time
+import numpy as np
+from .enums import Resource, Action
+
+class MetricsRecorder:
+    def __init__(self, directory, sample_every=60, max_characters=64, chunk_rows=4096):
+        self.directory = directory
+        self.sample_every = sample_every
+        self.max_characters = max_characters
+        self.chunk_rows = chunk_rows
+        self.actions = list(Action)
+        os.makedirs(directory, exist_ok=True)
+
+        # name -> (dtype, per-row shape); every column is one fixed-width file
+        self.columns = {
+            "game_time": ("int64", ()),
+            "world_wood": ("int32", ()),
+            "world_food": ("int32", ()),
+            "trees": ("int32", ()),
+            "food_sources": ("int32", ()),
+            "houses": ("int32", ()),
+            "farms": ("int32", ()),
+            "monsters": ("int32", ()),
+            "monster_level": ("int32", ()),
+            "population": ("int32", ()),
+            "alive": ("uint8", (max_characters,)),
+            "hp": ("float32", (max_characters,)),
+            "level": ("int16", (max_characters,)),
+            "wood": ("int32", (max_characters,)),
+            "food": ("int32", (max_characters,)),
+            "survival_time": ("int64", (max_characters,)),
+            "q_values": ("float32", (max_characters, len(self.actions))),
+        }
+        self.rows = 0
+        self.capacity = 0
+        self.arrays = {}
+        # character -> column slot. Keyed by the object, not id(): a dead character stays referenced,
+        # so a newborn can never reuse its id and inherit its column
+        self.slots = {}
+        self.names = []
+        self.dropped_characters = 0
+
+        # Overhead accounting
+        self.samples = 0
+        self.sample_time = 0.0
+        self.max_sample_time = 0.0
+
+        self._grow()
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _grow(self):
+        # Extend every column file by one chunk and remap it
+        self.flush()
+        self.capacity += self.chunk_rows
+        for name, (dtype, shape) in self.columns.items():
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+            with open(self._path(name), "ab") as f:
+                f.truncate(self.capacity * row_bytes)
+            self.arrays[name] = np.memmap(self._path(name), dtype=dtype, mode="r+",
+                                          shape=(self.capacity,) + shape)
+
+    def _slot(self, character):
+        slot = self.slots.get(character)
+        if slot is None:
+            if len(self.names) >= self.max_characters:
+                self.dropped_characters += 1
+                return None
+            slot = len(self.names)
+            self.slots[character] = slot
+            self.names.append(character.name)
+        return slot
+
+    def record(self, world):
+        if world.game_time % self.sample_every:
+            return
+        start = time.perf_counter()
+        if self.rows == self.capacity:
+            self._grow()
+
+        row = self.rows
+        a = self.arrays
+        a["game_time"][row] = world.game_time
+        a["world_wood"][row] = world.resources[Resource.WOOD]
+        a["world_food"][row] = world.resources[Resource.FOOD]
+        a["trees"][row] = len(world.tree_positions)
+        a["food_sources"][row] = len(world.food_positions)
+        a["houses"][row] = len(world.houses)
+        a["farms"][row] = len(world.farms)
+        a["monsters"][row] = len(world.monsters)
+        a["monster_level"][row] = max((m.level for m in world.monsters), default=0)
+        a["population"][row] = len(world.characters)
+
+        # Slots of characters that died earlier keep their last survival time
+        if row > 0:
+            a["survival_time"][row] = a["survival_time"][row - 1]
+        actions = self.actions
+        for character in world.characters:
+            slot = self._slot(character)
+            if slot is None:
+                continue
+            inventory = character.inventory
+            a["alive"][row, slot] = 1
+            a["hp"][row, slot] = character.hp
+            a["level"][row, slot] = character.level
+            a["wood"][row, slot] = inventory[Resource.WOOD]
+            a["food"][row, slot] = inventory[Resource.FOOD]
+            a["survival_time"][row, slot] = world.game_time - character.born
+            a["q_values"][row, slot] = [character.q_table[action] for action in actions]
+        self.rows += 1
+
+        elapsed = time.perf_counter() - start
+        self.samples += 1
+        self.sample_time += elapsed
+        self.max_sample_time = max(self.max_sample_time, elapsed)
+
+    def overhead(self):
+        # Seconds spent sampling, averaged per sample and per simulated tick
+        mean = self.sample_time / self.samples if self.samples else 0.0
+        return {
+            "samples": self.samples,
+            "mean_sample_seconds": mean,
+            "max_sample_seconds": self.max_sample_time,
+            "mean_tick_seconds": mean / self.sample_every,
+        }
+
+    def flush(self):
+        for array in self.arrays.values():
+            array.flush()
+        meta = {
+            "rows": self.rows,
+            "sample_every": self.sample_every,
+            "characters": self.names,
+            "actions": [action.value for action in self.actions],
+            "columns": {name: {"dtype": dtype, "shape": list(shape)}
+                        for name, (dtype, shape) in self.columns.items()},
+        }
+        # Write then rename so a live reader never sees a half-written file
+        meta_path = os.path.join(self.directory, "meta.json")
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def close(self):
+        self.flush()
+        self.arrays = {}
+
+
+class MetricsReader:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.rows = self.meta["rows"]
+        self.characters = self.meta["characters"]
+        self.actions = self.meta["actions"]
+        self.columns = self.meta["columns"]
+
+    def read(self, name, start=0, stop=None):
+        # Returns a read-only memory-mapped view, nothing is copied
+        column = self.columns[name]
+        stop = self.rows if stop is None else min(stop, self.rows)
+        if self.rows == 0:
+            return np.empty((0,) + tuple(column["shape"]), dtype=column["dtype"])
+        array = np.memmap(os.path.join(self.directory, f"{name}.bin"), dtype=column["dtype"],
+                          mode="r", shape=(self.rows,) + tuple(column["shape"]))
+        return array[start:stop]
+
+    def character(self, name):
+        return self.characters.index(name)
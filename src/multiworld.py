@@ -0,0 +1,146 @@
+import contextlib
+import random
+from .world import World
+from .roster import Roster
+from .character import choose_actions
+from .difficulty import DifficultyEngine
+
+# Phases that do nothing unless the named attribute of the world is set
+OPTIONAL_PHASES = {"record_metrics": "metrics", "publish_live_state": "live_state"}
+
+
+class MultiWorld:
+    def __init__(self, count, roster_config=None, shared_arena=False, difficulty=None):
+        self.worlds = []
+        for _ in range(count):
+            world = World()
+            world.log_actions = False
+            world.populate(Roster.from_config(roster_config or {}))
+            self.worlds.append(world)
+
+        # In a shared arena one spawner feeds monsters to every village
+        self.shared_arena = shared_arena
+        self.difficulty = difficulty or DifficultyEngine(spawn_interval=300 // max(1, count),
+                                                          max_monsters=5 * count)
+        if shared_arena:
+            for world in self.worlds:
+                world.monster_spawning = False
+
+        self.game_time = 0
+        self.plan_worlds = None
+        self.plan = None
+
+    def population(self, worlds):
+        return [(world, character) for world in worlds for character in world.characters]
+
+    def active_worlds(self):
+        return [world for world in self.worlds if not world.game_over]
+
+    def is_done(self):
+        return all(world.game_over for world in self.worlds)
+
+    def step(self):
+        # Advance every world by one frame: each of World.step_phases runs across all worlds
+        # before the next one starts, and decisions are batched over every village
+        worlds = self.active_worlds()
+        if any(world.memory is not None for world in worlds):
+            self.step_measured(worlds)
+        else:
+            self.step_phases(worlds)
+
+        if self.shared_arena:
+            self.update_arena(worlds)
+
+        self.game_time += 1
+
+    def step_phases(self, worlds):
+        # Bound phase methods are looked up once per set of villages, not once per world per tick
+        if worlds != self.plan_worlds:
+            self.plan_worlds = worlds
+            self.plan = [(name, OPTIONAL_PHASES.get(name), [getattr(world, name) for world in worlds])
+                         for name in World.step_phases]
+        decision_frame = self.game_time % 60 == 0
+        for name, attachment, phases in self.plan:
+            if attachment is not None:
+                # Nothing to do for villages without a recorder attached
+                for world in worlds:
+                    if getattr(world, attachment) is not None:
+                        getattr(world, name)()
+            elif name == "update_decisions" and decision_frame:
+                self.decide_all(self.population(worlds))
+            elif name == "update_needs":
+                # Most frames nobody is due to die; only look at villages with a death due
+                for world, phase in zip(worlds, phases):
+                    deaths = world.deaths
+                    if deaths and deaths[0][0] <= world.game_time:
+                        phase()
+            else:
+                for phase in phases:
+                    phase()
+
+    def step_measured(self, worlds):
+        # Same order, with each phase measured by the MemoryTracker of every world it runs for
+        for name in World.step_phases:
+            if name == "update_decisions" and self.game_time % 60 == 0:
+                self.run_phase(worlds, name, lambda: self.decide_all(self.population(worlds)))
+                continue
+            for world in worlds:
+                self.run_phase([world], name, getattr(world, name))
+        for world in worlds:
+            if world.memory is not None:
+                world.memory.tick()
+
+    def run_phase(self, worlds, name, function):
+        with contextlib.ExitStack() as stack:
+            for world in worlds:
+                if world.memory is not None:
+                    stack.enter_context(world.memory.phase(name))
+            function()
+
+    def decide_all(self, population):
+        # One batched choice for the idle characters of every village, started grouped by action
+        learners = {}
+        for world, character in population:
+            if world.learner is not None:
+                learners.setdefault(id(world.learner), (world.learner, []))[1].append(character)
+        for learner, characters in learners.values():
+            learner.on_decision(characters)
+
+        idle = [(world, character) for world, character in population
+                if world.auto_decide and character.action_state == "idle"]
+        groups = {}
+        for (world, character), action in zip(idle, choose_actions([character for _, character in idle])):
+            groups.setdefault(action, []).append((world, character))
+        for action, group in groups.items():
+            for world, character in group:
+                world.start_action(character, action)
+
+    def update_arena(self, worlds):
+        # Villages that have fallen hand their monsters over to the survivors
+        survivors = [world for world in worlds if not world.game_over]
+        if not survivors:
+            return
+        for world in worlds:
+            if world.game_over and world.monsters:
+                for monster in world.monsters:
+                    monster.dormant = False  # The new village classifies it afresh
+                    survivor = random.choice(survivors)
+                    monster.adopt(survivor)
+                    survivor.monsters.append(monster)
+                world.monsters = []
+
+        difficulty = self.difficulty
+        difficulty.spawn_timer += 1
+        if difficulty.spawn_timer >= difficulty.spawn_interval:
+            difficulty.spawn_timer = 0
+            total_monsters = sum(len(world.monsters) for world in survivors)
+            if total_monsters < difficulty.max_monsters:
+                world = difficulty.random.choice(survivors)
+                world.spawn_monster(difficulty.monster_level(world), difficulty.random)
+
+    def run(self, max_frames):
+        for _ in range(max_frames):
+            if self.is_done():
+                break
+            self.step()
+        return [world.game_time for world in self.worlds]
@@ -0,0 +1,192 @@
+import heapq
+import math
+from collections import OrderedDict
+from .grid import Grid
+
+SQRT2 = math.sqrt(2)
+BLOCKED_COST = 20  # Extra cost per blocked cell, so a character standing in a house can still leave it
+
+class Navigator:
+    # Character pathfinding around houses and farms on its own fine grid.
+    # Obstacles are tracked per cell with counts so they can overlap and be removed again.
+    def __init__(self, width, height, top, cell_size=20, region_size=4, max_cached_paths=2048):
+        self.grid = Grid(width, height, cell_size, top)
+        self.counts = bytearray(self.grid.size)  # Obstacles covering each cell
+        self.obstacles = {}  # key -> cells it covers
+        self.region_size = region_size
+        # (start cell, goal cell) -> waypoints, least recently used first
+        self.paths = OrderedDict()
+        self.max_cached_paths = max_cached_paths
+        self.region_paths = {}  # region -> cache keys of paths crossing it
+        self.farms_version = None
+        self.searches = 0
+        self.cache_hits = 0
+        self.direct = 0
+
+    def region_of(self, cell):
+        cols = self.grid.cols
+        return (cell % cols) // self.region_size, (cell // cols) // self.region_size
+
+    def set_obstacle(self, key, left, top, right, bottom):
+        old = self.obstacles.get(key, ())
+        new = self.grid.cells_in_rect(left, top, right, bottom)
+        if old == new:
+            return
+        self.remove_obstacle(key)
+        self.obstacles[key] = new
+        for cell in new:
+            self.counts[cell] += 1
+        self.invalidate(new)
+
+    def remove_obstacle(self, key):
+        cells = self.obstacles.pop(key, None)
+        if not cells:
+            return
+        for cell in cells:
+            self.counts[cell] -= 1
+        # Freed cells only make cached paths longer than necessary, never wrong,
+        # but dropping the paths nearby keeps routes short after a change
+        self.invalidate(cells)
+
+    def invalidate(self, cells):
+        for region in set(self.region_of(cell) for cell in cells):
+            for key in self.region_paths.pop(region, ()):
+                self.paths.pop(key, None)
+
+    def add_house(self, house):
+        half_size = (30 + (house.level - 1) * 10) / 2
+        self.set_obstacle(("house", id(house)), house.x - half_size, house.y - half_size,
+                          house.x + half_size, house.y + half_size)
+
+    def sync_farms(self, farms):
+        # Farms are only ever added by the FarmField, so follow its version and block the new ones
+        if farms.version == self.farms_version:
+            return
+        self.farms_version = farms.version
+        for farm in farms:
+            key = ("farm", id(farm))
+            if key not in self.obstacles:
+                self.set_obstacle(key, farm.x - 15, farm.y - 15, farm.x + 15, farm.y + 15)
+
+    def is_clear(self, x0, y0, x1, y1, start, goal):
+        # Walk every cell the segment touches; the start and goal cells never block
+        grid = self.grid
+        size = grid.cell_size
+        cols, rows = grid.cols, grid.rows
+        counts = self.counts
+        gx0, gy0 = x0 / size, (y0 - grid.top) / size
+        gx1, gy1 = x1 / size, (y1 - grid.top) / size
+        cx, cy = math.floor(gx0), math.floor(gy0)
+        dx, dy = gx1 - gx0, gy1 - gy0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        delta_x = abs(1 / dx) if dx else math.inf
+        delta_y = abs(1 / dy) if dy else math.inf
+        next_x = ((cx + 1 - gx0) if dx > 0 else (gx0 - cx)) * delta_x if dx else math.inf
+        next_y = ((cy + 1 - gy0) if dy > 0 else (gy0 - cy)) * delta_y if dy else math.inf
+        for _ in range(abs(math.floor(gx1) - cx) + abs(math.floor(gy1) - cy) + 1):
+            if 0 <= cx < cols and 0 <= cy < rows:
+                cell = cy * cols + cx
+                if counts[cell] and cell != start and cell != goal:
+                    return False
+            if next_x < next_y:
+                cx += step_x
+                next_x += delta_x
+            else:
+                cy += step_y
+                next_y += delta_y
+        return True
+
+    def route(self, x, y, target):
+        # Waypoints from (x, y) to target, ending exactly at target
+        grid = self.grid
+        start = grid.index(x, y)
+        goal = grid.index(*target)
+        if start == goal or self.is_clear(x, y, target[0], target[1], start, goal):
+            self.direct += 1
+            return [target]
+
+        key = (start, goal)
+        cells = self.paths.get(key)
+        if cells is not None:
+            self.paths.move_to_end(key)
+            self.cache_hits += 1
+        else:
+            cells = self.search(start, goal)
+            self.store(key, cells)
+
+        waypoints = [grid.center(cell) for cell in cells[1:-1]]
+        waypoints.append(target)
+        return self.smooth((x, y), waypoints, start, goal)
+
+    def store(self, key, cells):
+        self.paths[key] = cells
+        for region in set(self.region_of(cell) for cell in cells):
+            self.region_paths.setdefault(region, set()).add(key)
+        if len(self.paths) > self.max_cached_paths:
+            # Stale keys left in region_paths are harmless, invalidate() ignores them
+            self.paths.popitem(last=False)
+
+    def smooth(self, origin, waypoints, start, goal):
+        # Skip every waypoint that can be reached in a straight line
+        result = []
+        x, y = origin
+        i = 0
+        while i < len(waypoints) - 1:
+            j = len(waypoints) - 1
+            while j > i and not self.is_clear(x, y, waypoints[j][0], waypoints[j][1], start, goal):
+                j -= 1
+            x, y = waypoints[j]
+            result.append(waypoints[j])
+            i = j + 1 if j > i else i + 1
+        if not result or result[-1] != waypoints[-1]:
+            result.append(waypoints[-1])
+        return result
+
+    def search(self, start, goal):
+        # A* over 8-connected cells; blocked cells and cut corners are expensive, not forbidden
+        grid = self.grid
+        cols = grid.cols
+        counts = self.counts
+        neighbours = grid.neighbours
+        goal_x, goal_y = goal % cols, goal // cols
+        self.searches += 1
+
+        def heuristic(cell):
+            dx = abs(cell % cols - goal_x)
+            dy = abs(cell // cols - goal_y)
+            return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+        cost = {start: 0.0}
+        came_from = {start: None}
+        closed = set()
+        heap = [(heuristic(start), start)]
+        while heap:
+            _, cell = heapq.heappop(heap)
+            if cell in closed:
+                continue
+            closed.add(cell)
+            if cell == goal:
+                path = []
+                while cell is not None:
+                    path.append(cell)
+                    cell = came_from[cell]
+                path.reverse()
+                return path
+            cell_cost = cost[cell]
+            cx, cy = cell % cols, cell // cols
+            for neighbour in neighbours[cell]:
+                nx, ny = neighbour % cols, neighbour // cols
+                step = 1.0
+                if counts[neighbour] and neighbour != goal:
+                    step += BLOCKED_COST
+                if nx != cx and ny != cy:
+                    step += SQRT2 - 1
+                    if counts[cy * cols + nx] or counts[ny * cols + cx]:
+                        step += BLOCKED_COST
+                new_cost = cell_cost + step
+                if new_cost < cost.get(neighbour, math.inf):
+                    cost[neighbour] = new_cost
+                    came_from[neighbour] = cell
+                    heapq.heappush(heap, (new_cost + heuristic(neighbour), neighbour))
+        return [start, goal]
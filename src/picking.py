@@ -0,0 +1,76 @@
+import pygame
+
+class Picker:
+    def __init__(self, cell_size=40, max_cached_tooltips=64):
+        self.cell_size = cell_size
+        # (cx, cy) -> [(kind, index, rect)] for every cell a hover rect overlaps
+        self.cells = {}
+        self.key = None
+        self.font = None
+        self.line_height = 20
+        self.tooltips = {}  # Tooltip lines -> pre-rendered surface
+        self.max_cached_tooltips = max_cached_tooltips
+
+    def _add(self, kind, index, rect):
+        x0, y0 = rect.left // self.cell_size, rect.top // self.cell_size
+        x1, y1 = (rect.right - 1) // self.cell_size, (rect.bottom - 1) // self.cell_size
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self.cells.setdefault((cx, cy), []).append((kind, index, rect))
+
+    def rebuild(self, world):
+        # Houses are only ever appended and farms bump a version when one is added
+        key = (len(world.houses), world.farms.version)
+        if key == self.key:
+            return
+        self.key = key
+        self.cells = {}
+        for i, house in enumerate(world.houses):
+            self._add("house", i, pygame.Rect(house.x - 20, house.y - 20, 40, 40))
+        for i, farm in enumerate(world.farms):
+            self._add("farm", i, pygame.Rect(farm.x - 15, farm.y - 15, 30, 30))
+
+    def pick(self, world, pos):
+        self.rebuild(world)
+        bucket = self.cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size))
+        if not bucket:
+            return None
+        # Later entities are drawn on top, so they win
+        for kind, index, rect in reversed(bucket):
+            if rect.collidepoint(pos):
+                if kind == "house":
+                    return world.houses[index]
+                return world.farms.farms[index]
+        return None
+
+    def tooltip_surface(self, lines):
+        surface = self.tooltips.get(lines)
+        if surface is not None:
+            return surface
+
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        max_width = max(self.font.size(line)[0] for line in lines)
+        surface = pygame.Surface((max_width + 10, len(lines) * self.line_height + 10))
+        surface.fill((40, 40, 40))
+        pygame.draw.rect(surface, (100, 100, 100), surface.get_rect(), 1)
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, (255, 255, 255))
+            surface.blit(text, (5, 5 + i * self.line_height))
+
+        if len(self.tooltips) >= self.max_cached_tooltips:
+            self.tooltips.clear()
+        self.tooltips[lines] = surface
+        return surface
+
+    def draw_hover(self, screen, world, tooltip_lines):
+        mouse_pos = pygame.mouse.get_pos()
+        entity = self.pick(world, mouse_pos)
+        if entity is None:
+            return
+        surface = self.tooltip_surface(tooltip_lines(entity))
+
+        # Adjust position to keep tooltip on screen
+        tooltip_x = min(mouse_pos[0] + 10, world.width - surface.get_width() - 10)
+        tooltip_y = min(mouse_pos[1] + 10, world.height - surface.get_height() - 10)
+        screen.blit(surface, (tooltip_x, tooltip_y))
@@ -0,0 +1,24 @@
+class RegenMap:
+    def __init__(self, grid, radius):
+        self.grid = grid
+        self.radius = radius
+        # HP regenerated per frame by a character standing in each cell
+        self.regen = [0.0] * grid.size
+
+    def add_house(self, house):
+        # Paint the house's benefit onto every cell whose centre is in range; levels only go up
+        hp_regen = house.hp_regen()
+        radius_squared = self.radius ** 2
+        for index in self.grid.cells_in_radius(house.x, house.y, self.radius):
+            x, y = self.grid.center(index)
+            if (x - house.x) ** 2 + (y - house.y) ** 2 <= radius_squared:
+                if hp_regen > self.regen[index]:
+                    self.regen[index] = hp_regen
+
+    def rebuild(self, houses):
+        self.regen = [0.0] * self.grid.size
+        for house in houses:
+            self.add_house(house)
+
+    def at(self, x, y):
+        return self.regen[self.grid.index(x, y)]
@@ -0,0 +1,73 @@
+import threading
+import time
+import pygame
+
+class RenderPipeline:
+    def __init__(self, size, background=(50, 100, 50), threaded=True):
+        self.background = background
+        self.threaded = threaded  # Without a thread, publish() draws the frame before returning
+        # Finished frames: the render thread draws into back while front is shown
+        self.front = pygame.Surface(size)
+        self.back = pygame.Surface(size)
+        self.front.fill(background)
+        # Snapshots: the newest published one waits in pending until the render thread takes it
+        self.pending = None
+        self.condition = threading.Condition()
+        self.frame_lock = threading.Lock()
+        self.running = False
+        self.thread = None
+        self.frames_published = 0
+        self.frames_rendered = 0
+        self.draw_time = 0.0  # Seconds the last frame took to draw
+
+    def start(self):
+        if not self.threaded:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="render", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def publish(self, world):
+        # Called from the simulation thread once per displayed frame
+        snapshot = world.snapshot()
+        if not self.threaded:
+            self._render(snapshot)
+            return
+        with self.condition:
+            # An older snapshot that was never drawn is simply replaced
+            self.pending = snapshot
+            self.frames_published += 1
+            self.condition.notify()
+
+    def present(self, screen):
+        with self.frame_lock:
+            screen.blit(self.front, (0, 0))
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and self.pending is None:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                snapshot = self.pending
+                self.pending = None
+            self._render(snapshot)
+
+    def _render(self, snapshot):
+        start = time.perf_counter()
+        self.back.fill(self.background)
+        snapshot.draw(self.back)
+        self.draw_time = time.perf_counter() - start
+
+        with self.frame_lock:
+            self.front, self.back = self.back, self.front
+        self.frames_rendered += 1
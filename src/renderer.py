@@ -0,0 +1,342 @@
+import pygame
+from .enums import Resource
+from .buildings import House
+from .picking import Picker
+from .sprites import SpriteAtlas
+from .governor import NO_EFFECTS, NO_TOOLTIPS, PLAIN_MONSTERS
+
+class WorldRenderer:
+    def __init__(self, world):
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.ui_font = pygame.font.Font(None, 24)
+        self.title_font = pygame.font.Font(None, 36)
+        self.game_over_font = None
+        self.time_font = None
+        # Rearrange speed control positions
+        button_width = 20
+        button_height = 20
+        button_y = 55
+        self.speed_label_pos = (500, button_y)
+        self.decrease_button = pygame.Rect(560, button_y, button_width, button_height)
+        self.speed_value_pos = (590, button_y)
+        self.increase_button = pygame.Rect(630, button_y, button_width, button_height)
+        self.help_button = pygame.Rect(world.width - 70, 10, 60, 30)  # x, y, width, height
+        self.picker = Picker()  # Resolves the hovered house or farm for tooltips
+        self.sprites = SpriteAtlas(world)  # Every entity is drawn from these pre-rendered surfaces
+        self.quality = 0  # FrameGovernor level; higher levels leave out more detail
+        self.frame_status = None  # Quality and frame time shown in the stats panel
+
+    def draw(self, world, screen):
+        sprites = self.sprites
+        
+        # Draw game background
+        screen.blit(sprites.background, (0, world.game_area_start))
+        
+        # Draw resources and entities, one pre-rendered sprite each
+        blits = []
+        surface, (dx, dy) = sprites.tree
+        blits.extend((surface, (x + dx, y + dy)) for x, y in world.tree_positions)
+        surface, (dx, dy) = sprites.food
+        blits.extend((surface, (x + dx, y + dy)) for x, y in world.food_positions)
+        for house in world.houses:
+            surface, (dx, dy) = sprites.house(house.level)
+            blits.append((surface, (house.x + dx, house.y + dy)))
+        for farm in world.farms:
+            surface, (dx, dy) = sprites.farm(farm)
+            blits.append((surface, (farm.x + dx, farm.y + dy)))
+        screen.blits(blits, doreturn=False)
+        quality = self.quality
+        if quality < NO_TOOLTIPS:
+            self.picker.draw_hover(screen, world, self.tooltip_lines)
+            
+        # Draw characters: body, HP bar and name
+        sprites.keep(world.characters)
+        blits = []
+        for character in world.characters:
+            x, y = character.x, character.y
+            for surface, (dx, dy) in (sprites.character(character.color),
+                                      sprites.character_hp_bar(character),
+                                      sprites.name_label(character.name)):
+                blits.append((surface, (x + dx, y + dy)))
+        screen.blits(blits, doreturn=False)
+            
+        # Draw animations
+        if quality < NO_EFFECTS:
+            for effect in world.effects:
+                self.draw_effect(screen, effect, world.game_time)
+            
+        # Draw monsters: body with level text, and HP bar
+        show_level = quality < PLAIN_MONSTERS
+        blits = []
+        for monster in world.monsters:
+            x, y = monster.x, monster.y
+            for surface, (dx, dy) in (sprites.monster(monster.level if show_level else None),
+                                      sprites.monster_hp_bar(monster)):
+                blits.append((surface, (x + dx, y + dy)))
+        screen.blits(blits, doreturn=False)
+            
+        # Draw UI
+        self.draw_ui(world, screen)
+        
+        # Draw help button
+        self.draw_help_button(world, screen)
+        
+        if world.show_help:
+            self.draw_help_overlay(world, screen)
+        
+        # If game is over, draw overlay and final time
+        if world.game_over:
+            # Semi-transparent overlay
+            overlay = pygame.Surface((world.width, world.height))
+            overlay.fill((0, 0, 0))
+            overlay.set_alpha(128)
+            screen.blit(overlay, (0, 0))
+            
+            # Game Over text
+            if self.game_over_font is None:
+                self.game_over_font = pygame.font.Font(None, 96)
+                self.time_font = pygame.font.Font(None, 64)
+            game_over_text = self.game_over_font.render("GAME OVER!", True, (255, 0, 0))
+            text_x = world.width // 2 - game_over_text.get_width() // 2
+            text_y = world.height // 2 - game_over_text.get_height()
+            screen.blit(game_over_text, (text_x, text_y))
+            
+            # Survival time text
+            time_text = self.time_font.render(f"Survival Time: {world.format_time()}", True, (255, 255, 255))
+            time_x = world.width // 2 - time_text.get_width() // 2
+            time_y = text_y + game_over_text.get_height() + 20
+            screen.blit(time_text, (time_x, time_y))
+
+    def draw_effect(self, screen, effect, now):
+        age = now - effect.born
+        alpha = max(0, min(255, (effect.lifetime - age) * 4))
+        text = effect.text if effect.count == 1 else f"{effect.text} x{effect.count}"
+        text_surface = self.sprites.effect_text(text, effect.color)
+        text_surface.set_alpha(alpha)
+        screen.blit(text_surface, (effect.x, effect.y - age))  # Float up
+
+    def tooltip_lines(self, entity):
+        if isinstance(entity, House):
+            return (
+                f"Level {entity.level} House",
+                f"HP Recovery: {entity.level_benefits[entity.level]['hp_regen'] * 100}% per second"
+            )
+        return (
+            f"Farm ({entity.plots}/{entity.capacity} plots)",
+            f"Growth: {entity.growth * 100 // entity.growth_time}%",
+            "Produces: 2 Food",
+            "Cost: 1 Food"
+        )
+
+    def draw_ui(self, world, screen):
+        # Draw main UI background
+        ui_surface = pygame.Surface((world.width, world.ui_height))
+        ui_surface.fill((40, 40, 40))
+        screen.blit(ui_surface, (0, 0))
+        
+        # Draw instruction panel
+        instruction_height = 45
+        instruction_surface = pygame.Surface((world.width, instruction_height))
+        instruction_surface.fill((60, 60, 80))
+        screen.blit(instruction_surface, (0, 0))
+        
+        # Single line instruction
+        instructions = "Move mouse to desired location, then press 1 to plant tree | Press 2 to plant food"
+        
+        instruction_text = self.ui_font.render(instructions, True, (255, 255, 255))
+        padding = 20
+        screen.blit(instruction_text, (padding, 18))  # Centered vertically in the instruction panel
+        
+        # Draw world stats panel
+        stats_y = instruction_height
+        stats_height = 35
+        stats_surface = pygame.Surface((world.width, stats_height))
+        stats_surface.fill((50, 50, 50))
+        screen.blit(stats_surface, (0, stats_y))
+        
+        stats_padding = 20
+        world_stats = [
+            f"Trees: {world.resources[Resource.WOOD]}",
+            f"Food: {world.resources[Resource.FOOD]}",
+            f"Next Growth: {(world.ecology.update_interval - world.ecology.timer) // 60}s"
+        ]
+        
+        x_pos = stats_padding
+        stats_text_y = stats_y + 10
+        for text in world_stats:
+            text_surface = self.ui_font.render(text, True, (255, 255, 255))
+            screen.blit(text_surface, (x_pos, stats_text_y))
+            x_pos += 120
+        
+        # Render quality and frame time, right-aligned before the speed controls
+        if self.frame_status:
+            status_text = self.ui_font.render(self.frame_status, True, (200, 200, 200))
+            screen.blit(status_text, (self.speed_label_pos[0] - status_text.get_width() - 15, stats_text_y))
+        
+        # Draw timer
+        timer_text = self.title_font.render(world.format_time(), True, (255, 255, 255))
+        timer_x = world.width - timer_text.get_width() - 20
+        screen.blit(timer_text, (timer_x, stats_text_y))
+        
+        # Draw character stats panel
+        char_stats_y = stats_y + stats_height
+        char_stats_height = 100
+        char_stats_surface = pygame.Surface((world.width, char_stats_height))
+        char_stats_surface.fill((30, 30, 30))
+        screen.blit(char_stats_surface, (0, char_stats_y))
+        
+        if len(world.characters) > 0:  # Only draw character stats if there are characters alive
+            # Large populations only show the first few characters
+            max_panels = 4
+            shown = world.characters[:max_panels]
+            x_spacing = world.width // len(shown)
+            for i, char in enumerate(shown):
+                if char.is_dead:
+                    continue
+                
+                x_pos = i * x_spacing + 20
+                y_pos = char_stats_y + 10
+                
+                # Character name with level
+                name_text = self.title_font.render(f"{char.name} (Lvl {char.level})", True, char.color)
+                screen.blit(name_text, (x_pos, y_pos))
+                
+                # Stats text
+                stats = [
+                    f"HP: {int(char.hp)}/{char.max_hp}",
+                    f"Attack: {char.attack_damage} Damage",
+                    f"Exp. to level up: {char.exp_to_next_level - char.exp}"
+                ]
+                
+                for j, stat in enumerate(stats):
+                    stat_text = self.ui_font.render(stat, True, (255, 255, 255))
+                    screen.blit(stat_text, (x_pos, y_pos + 25 + j * 20))
+            
+            hidden = len(world.characters) - len(shown)
+            if hidden > 0:
+                more_text = self.ui_font.render(f"+{hidden} more", True, (200, 200, 200))
+                screen.blit(more_text, (world.width - more_text.get_width() - 10,
+                                        char_stats_y + char_stats_height - 25))
+        else:  # Show only game over text in the panel
+            game_over_text = self.title_font.render("GAME OVER!", True, (255, 0, 0))
+            text_x = world.width // 2 - game_over_text.get_width() // 2
+            text_y = char_stats_y + (char_stats_height // 2) - game_over_text.get_height() // 2
+            screen.blit(game_over_text, (text_x, text_y))
+        
+        # Draw speed controls in new order
+        # Draw "Speed:" label
+        speed_label = self.ui_font.render("Speed:", True, (255, 255, 255))
+        screen.blit(speed_label, self.speed_label_pos)
+        
+        # Draw decrease button (-)
+        pygame.draw.rect(screen, (100, 100, 100), self.decrease_button)
+        pygame.draw.rect(screen, (200, 200, 200), self.decrease_button, 2)
+        minus_text = self.ui_font.render("-", True, (255, 255, 255))
+        screen.blit(minus_text, (self.decrease_button.centerx - 4, self.decrease_button.centery - 8))
+        
+        # Draw speed value
+        speed_value = self.ui_font.render(f"{world.game_speed}x", True, (255, 255, 255))
+        screen.blit(speed_value, self.speed_value_pos)
+        
+        # Draw increase button (+)
+        pygame.draw.rect(screen, (100, 100, 100), self.increase_button)
+        pygame.draw.rect(screen, (200, 200, 200), self.increase_button, 2)
+        plus_text = self.ui_font.render("+", True, (255, 255, 255))
+        screen.blit(plus_text, (self.increase_button.centerx - 4, self.increase_button.centery - 8))
+
+    def handle_mouse_event(self, world, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.decrease_button.collidepoint(event.pos):
+                world.game_speed = max(1, world.game_speed - 1)
+            elif self.increase_button.collidepoint(event.pos):
+                world.game_speed = min(world.max_speed, world.game_speed + 1)
+
+    def draw_help_button(self, world, screen):
+        # Draw help button
+        pygame.draw.rect(screen, (0, 153, 255), self.help_button)
+        help_text = self.ui_font.render("Help", True, (255, 255, 255))
+        text_x = self.help_button.centerx - help_text.get_width() // 2
+        text_y = self.help_button.centery - help_text.get_height() // 2
+        screen.blit(help_text, (text_x, text_y))
+
+    def draw_help_overlay(self, world, screen):
+        if not world.show_help:
+            return
+        
+        # Semi-transparent overlay
+        overlay = pygame.Surface((world.width, world.height))
+        overlay.fill((0, 0, 0))
+        overlay.set_alpha(180)
+        screen.blit(overlay, (0, 0))
+        
+        # Define help box dimensions
+        box_width = 400
+        box_height = 400
+        box_x = world.width//2 - box_width//2
+        box_y = 80
+        
+        # Draw help box background
+        pygame.draw.rect(screen, (40, 40, 40), (box_x, box_y, box_width, box_height))
+        # Draw box border
+        pygame.draw.rect(screen, (100, 100, 100), (box_x, box_y, box_width, box_height), 2)
+        
+        # Help content
+        help_title = self.title_font.render(f"Help (Page {world.help_page}/{world.total_help_pages})", True, (255, 255, 255))
+        screen.blit(help_title, (world.width//2 - help_title.get_width()//2, box_y + 20))
+        
+        # Different instructions based on page
+        if world.help_page == 1:
+            instructions = [
+                ("Basic Controls", True),  # True indicates it's a heading
+                ("1: Plant trees", False),
+                ("2: Plant food", False),
+                ("+/-: Game speed", False),
+                ("", False)
+            ]
+        elif world.help_page == 2:
+            instructions = [
+                ("Combat System", True),
+                ("Auto-attack nearby monsters", False),
+                ("Gain EXP from kills", False),
+                ("Share EXP in range", False),
+                ("", False),
+                ("Monsters", True),
+                ("Spawn from edges", False),
+                ("Get stronger over time", False)
+            ]
+        else:  # page 3
+            instructions = [
+                ("Resources", True),
+                ("Trees -> Wood", False),
+                ("Food -> Health", False),
+                ("Auto-regenerate", False),
+                ("", False),
+                ("Buildings", True),
+                ("Houses: 5 wood", False),
+                ("Upgrades: 8 / 15 wood", False),
+                ("Heal nearby characters", False)
+            ]
+        
+        y = box_y + 80  # Start text below title
+        for line, is_heading in instructions:
+            font = self.title_font if is_heading else self.ui_font
+            text = font.render(line, True, (255, 255, 255))
+            screen.blit(text, (world.width//2 - text.get_width()//2, y))
+            y += 35 if is_heading else 30
+        
+        # Add arrow key indicators
+        if world.help_page > 1:
+            left_arrow = "<- Previous"
+        else:
+            left_arrow = "         "
+            
+        if world.help_page < world.total_help_pages:
+            right_arrow = "Next ->"
+        else:
+            right_arrow = "      "
+        
+        # Draw navigation hints with fixed spacing
+        spacing = " " * 20  # Create consistent space between arrows
+        nav_text = self.ui_font.render(f"{left_arrow}{spacing}{right_arrow}", True, (200, 200, 200))
+        screen.blit(nav_text, (world.width//2 - nav_text.get_width()//2, box_y + box_height - 50))
@@ -0,0 +1,233 @@
+import threading
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from .character import ACTIONS
+
+class ReplayBuffer:
+    # Fixed-capacity ring of (agent, action, reward) transitions over NumPy arrays.
+    # With shared=True the arrays live in one shared memory block that other processes can attach to.
+    def __init__(self, capacity=65536, shared=False, name=None):
+        self.capacity = capacity
+        self.layout = [
+            ("header", np.int64, (1,)),  # Total transitions ever added
+            ("agent", np.int32, (capacity,)),
+            ("action", np.int8, (capacity,)),
+            ("reward", np.float32, (capacity,)),
+        ]
+        size = sum(np.dtype(dtype).itemsize * shape[0] for _, dtype, shape in self.layout)
+        self.memory = None
+        if shared or name is not None:
+            self.memory = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+            buffer = self.memory.buf
+        else:
+            buffer = bytearray(size)
+        offset = 0
+        for field, dtype, shape in self.layout:
+            array = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+        if name is None:
+            self.header.fill(0)
+
+    @classmethod
+    def attach(cls, name, capacity):
+        return cls(capacity, name=name)
+
+    @property
+    def name(self):
+        return self.memory.name if self.memory is not None else None
+
+    def __len__(self):
+        return int(min(self.header[0], self.capacity))
+
+    def add(self, agent, action, reward):
+        # Single writer: the row is written before the counter that makes it visible
+        added = int(self.header[0])
+        i = added % self.capacity
+        self.agent[i] = agent
+        self.action[i] = action
+        self.reward[i] = reward
+        self.header[0] = added + 1
+
+    def discard(self, agent):
+        # The rows stay in the ring until overwritten but are never sampled again
+        filled = self.agent[:len(self)]
+        filled[filled == agent] = -1
+
+    def sample(self, batch_size, rng):
+        indices = rng.integers(0, len(self), batch_size)
+        agents = self.agent[indices]
+        live = agents >= 0
+        if not live.all():
+            indices = indices[live]
+            agents = agents[live]
+        return agents, self.action[indices], self.reward[indices]
+
+    def close(self, unlink=False):
+        if self.memory is not None:
+            # Views must go before the block can be closed
+            self.header = self.agent = self.action = self.reward = None
+            self.memory.close()
+            if unlink:
+                self.memory.unlink()
+            self.memory = None
+
+
+def q_update(q, agents, actions, rewards, learning_rate, discount):
+    # The tabular rule from Character.learn, applied to a whole minibatch at once. Rows hitting
+    # the same (agent, action) are averaged: a few villagers fill a batch with duplicates, and
+    # one full step per duplicate would overshoot and diverge.
+    next_max = q[agents].max(axis=1)
+    error = rewards + discount * next_max - q[agents, actions]
+    cells = agents * q.shape[1] + actions
+    total = np.bincount(cells, weights=error, minlength=q.size)
+    count = np.bincount(cells, minlength=q.size)
+    hit = count > 0
+    flat = q.reshape(-1)  # A view, so the update lands in q
+    flat[hit] += learning_rate * total[hit] / count[hit]
+
+
+def _learn_in_process(buffer_name, capacity, q_name, q_shape, learning_rate, discount,
+                      batch_size, interval, stop):
+    buffer = ReplayBuffer.attach(buffer_name, capacity)
+    memory = shared_memory.SharedMemory(name=q_name)
+    q = np.ndarray(q_shape, dtype=np.float32, buffer=memory.buf)
+    rng = np.random.default_rng()
+    while not stop.is_set():
+        if len(buffer) >= batch_size:
+            q_update(q, *buffer.sample(batch_size, rng), learning_rate, discount)
+        else:
+            time.sleep(interval)
+    del q
+    memory.close()
+    buffer.close()
+
+
+class ReplayLearner:
+    # Records every reward the world hands out and learns the Q-tables from sampled minibatches.
+    # mode: "inline" updates on decision frames, "thread" and "process" learn in the background.
+    def __init__(self, capacity=65536, max_agents=256, batch_size=256, updates_per_decision=4,
+                 learning_rate=0.1, discount=0.95, mode="inline", seed=None):
+        if mode not in ("inline", "thread", "process"):
+            raise ValueError(f"Unknown learner mode: {mode}")
+        self.mode = mode
+        self.max_agents = max_agents
+        self.batch_size = batch_size
+        self.updates_per_decision = updates_per_decision
+        self.learning_rate = learning_rate
+        self.discount = discount
+        self.rng = np.random.default_rng(seed)
+        self.buffer = ReplayBuffer(capacity, shared=mode == "process")
+
+        # Q-values of every known character, one row per slot
+        shape = (max_agents, len(ACTIONS))
+        self.q_memory = None
+        if mode == "process":
+            self.q_memory = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+            self.q = np.ndarray(shape, dtype=np.float32, buffer=self.q_memory.buf)
+        else:
+            self.q = np.zeros(shape, dtype=np.float32)
+        self.slots = {}  # id(character) -> row in q
+        self.free_slots = list(range(max_agents - 1, -1, -1))
+        self.dropped = 0
+        self.updates = 0
+
+        self.lock = threading.Lock()
+        self.running = False
+        self.worker = None
+        self.stop_event = None
+
+    def slot(self, character):
+        slot = self.slots.get(id(character))
+        if slot is None:
+            if not self.free_slots:
+                self.dropped += 1
+                return None
+            slot = self.free_slots.pop()
+            self.slots[id(character)] = slot
+            with self.lock:
+                self.q[slot] = [character.q_table[action] for action in ACTIONS]
+        return slot
+
+    def release(self, character):
+        # Dead characters give their row back. Their transitions are discarded first, or the next
+        # character in the slot would learn from them.
+        slot = self.slots.pop(id(character), None)
+        if slot is not None:
+            with self.lock:
+                self.buffer.discard(slot)
+            self.free_slots.append(slot)
+
+    def record(self, character, action, reward):
+        slot = self.slot(character)
+        if slot is None:
+            return
+        with self.lock:
+            self.buffer.add(slot, ACTIONS.index(action), reward)
+
+    def update(self, batches=1):
+        if len(self.buffer) < self.batch_size:
+            return 0
+        for _ in range(batches):
+            # In thread mode the main thread reads and resets rows of q, so it is updated under the lock too
+            with self.lock:
+                agents, actions, rewards = self.buffer.sample(self.batch_size, self.rng)
+                q_update(self.q, agents, actions, rewards, self.learning_rate, self.discount)
+        self.updates += batches
+        return batches
+
+    def apply(self, characters):
+        # Copy the learned values back before the characters choose their next actions
+        slots = [self.slots.get(id(character)) for character in characters]
+        with self.lock:
+            rows = [self.q[slot].tolist() if slot is not None else None for slot in slots]
+        for character, row in zip(characters, rows):
+            if row is None:
+                continue
+            q_table = character.q_table
+            for i, action in enumerate(ACTIONS):
+                q_table[action] = row[i]
+
+    def on_decision(self, characters):
+        if self.mode == "inline":
+            self.update(self.updates_per_decision)
+        self.apply(characters)
+
+    def start(self, interval=0.001):
+        if self.mode == "inline" or self.running:
+            return
+        self.running = True
+        if self.mode == "thread":
+            self.worker = threading.Thread(target=self._run, args=(interval,), name="learner", daemon=True)
+        else:
+            self.stop_event = multiprocessing.Event()
+            self.worker = multiprocessing.Process(
+                target=_learn_in_process, name="learner", daemon=True,
+                args=(self.buffer.name, self.buffer.capacity, self.q_memory.name, self.q.shape,
+                      self.learning_rate, self.discount, self.batch_size, interval, self.stop_event))
+        self.worker.start()
+
+    def _run(self, interval):
+        while self.running:
+            if not self.update():
+                time.sleep(interval)
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        if self.stop_event is not None:
+            self.stop_event.set()
+        self.worker.join()
+        self.worker = None
+
+    def close(self):
+        self.stop()
+        self.buffer.close(unlink=True)
+        if self.q_memory is not None:
+            self.q = None
+            self.q_memory.close()
+            self.q_memory.unlink()
+            self.q_memory = None
@@ -0,0 +1,111 @@
+import colorsys
+import json
+import math
+import random
+from .character import Character
+
+# The classic three-character village: (name, x, y, color)
+DEFAULT_VILLAGERS = [
+    ("Alice", 200, 400, (100, 255, 100)),  # Green
+    ("Bob", 400, 400, (255, 100, 100)),  # Red
+    ("Charlie", 600, 400, (100, 100, 255)),  # Blue
+]
+
+NAME_PREFIXES = ["Al", "Bo", "Ca", "Da", "El", "Fi", "Gu", "Ha", "Io", "Ju", "Ki", "Lu", "Ma", "Ne", "Or", "Pe"]
+NAME_SUFFIXES = ["na", "rin", "lo", "ra", "do", "ssa", "mi", "ven", "tta", "ric", "ly", "son"]
+
+class Roster:
+    def __init__(self, size=3, villagers=DEFAULT_VILLAGERS, seed=None,
+                 birth_house_level=2, birth_interval=1800, max_population=None, character_config=None):
+        self.size = size
+        self.villagers = list(villagers)
+        # Without a seed, drawn from the global generator so random.seed() still reproduces a run
+        self.random = random.Random(seed if seed is not None else random.getrandbits(64))
+        # Every birth_interval frames each house of at least birth_house_level adds a villager
+        self.birth_house_level = birth_house_level
+        self.birth_interval = birth_interval
+        self.max_population = max_population if max_population is not None else size * 2
+        self.birth_timer = 0
+        self.created = 0
+        # Attribute overrides for every villager, e.g. {"learning_rate": 0.2, "biases": {...}}
+        self.character_config = character_config or {}
+
+    @classmethod
+    def from_config(cls, config):
+        config = dict(config)
+        if "villagers" in config:
+            config["villagers"] = [(v["name"], v["x"], v["y"], tuple(v["color"]))
+                                   for v in config["villagers"]]
+        return cls(**config)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_config(json.load(f))
+
+    def make_name(self, index):
+        if index < len(self.villagers):
+            return self.villagers[index][0]
+        index -= len(self.villagers)
+        prefix = NAME_PREFIXES[index % len(NAME_PREFIXES)]
+        suffix = NAME_SUFFIXES[(index // len(NAME_PREFIXES)) % len(NAME_SUFFIXES)]
+        generation = index // (len(NAME_PREFIXES) * len(NAME_SUFFIXES))
+        name = prefix + suffix
+        return f"{name} {generation + 1}" if generation else name
+
+    def make_color(self, index):
+        if index < len(self.villagers):
+            return self.villagers[index][3]
+        # Golden-ratio hue steps keep neighbouring villagers visually distinct
+        hue = (index * 0.618033988749895) % 1.0
+        r, g, b = colorsys.hsv_to_rgb(hue, 0.6, 1.0)
+        return (int(r * 255), int(g * 255), int(b * 255))
+
+    def spawn_positions(self, world):
+        if self.size <= len(self.villagers):
+            return [(x, y) for _, x, y, _ in self.villagers[:self.size]]
+
+        # Spread the population evenly over the game area
+        margin = 50
+        area_width = world.width - 2 * margin
+        area_height = world.height - world.game_area_start - 2 * margin
+        cols = max(1, math.ceil(math.sqrt(self.size * area_width / area_height)))
+        rows = math.ceil(self.size / cols)
+        positions = []
+        for i in range(self.size):
+            col, row = i % cols, i // cols
+            x = margin + (col + 0.5) * area_width / cols
+            y = world.game_area_start + margin + (row + 0.5) * area_height / rows
+            positions.append((x, y))
+        return positions
+
+    def create(self, x, y):
+        character = Character(self.make_name(self.created), x, y)
+        character.color = self.make_color(self.created)
+        for name, value in self.character_config.items():
+            if isinstance(value, dict):
+                getattr(character, name).update(value)
+            else:
+                setattr(character, name, value)
+        self.created += 1
+        return character
+
+    def populate(self, world):
+        for x, y in self.spawn_positions(world):
+            world.add_character(self.create(x, y))
+
+    def update(self, world):
+        self.birth_timer += 1
+        if self.birth_timer < self.birth_interval:
+            return
+        self.birth_timer = 0
+
+        for house in world.houses:
+            if len(world.characters) >= self.max_population:
+                break
+            if house.level >= self.birth_house_level:
+                x = house.x + self.random.randint(-30, 30)
+                y = max(world.game_area_start, house.y + self.random.randint(-30, 30))
+                character = self.create(x, y)
+                world.add_character(character)
+                world.add_effect(f"{character.name} was born!", x, y, (255, 182, 193))
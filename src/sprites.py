@@ -0,0 +1,176 @@
+from collections import OrderedDict
+import pygame
+
+class SpriteAtlas:
+    def __init__(self, world, max_cached=256):
+        self.font = pygame.font.Font(None, 20)
+        self.effect_font = pygame.font.Font(None, 24)
+        # key -> (surface, (dx, dy)) where the offset is from the entity position to the blit position
+        self.sprites = {}
+        # Bodies and name labels of the villagers, sized by the population through keep()
+        self.villagers = {}
+        # Monster levels and effect text have no upper bound; the least recently drawn go past max_cached
+        self.cached = OrderedDict()
+        self.max_cached = max_cached
+        self.background = self._build_background(world)
+        self.tree = self._build_tree()
+        self.food = self._build_food()
+        for level in (1, 2, 3):
+            self.sprites["house", level] = self._build_house(level)
+        for stage in range(4):
+            self.sprites["farm", stage] = self._build_farm(stage)
+
+    def _finish(self, surface):
+        # Match the display format when there is one, which makes blitting much cheaper
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+
+    def _build_background(self, world):
+        surface = pygame.Surface((world.width, world.height - world.game_area_start))
+        surface.fill((50, 100, 50))
+        grid_spacing = 50
+        for x in range(0, world.width, grid_spacing):
+            pygame.draw.line(surface, (60, 110, 60), (x, 0), (x, surface.get_height()))
+        for y in range(0, surface.get_height(), grid_spacing):
+            pygame.draw.line(surface, (60, 110, 60), (0, y), (world.width, y))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def _build_tree(self):
+        surface = pygame.Surface((30, 45), pygame.SRCALPHA)
+        pygame.draw.rect(surface, (139, 69, 19), (10, 25, 10, 20))
+        pygame.draw.circle(surface, (34, 139, 34), (15, 15), 15)
+        return self._finish(surface), (-15, -25)
+
+    def _build_food(self):
+        surface = pygame.Surface((17, 17), pygame.SRCALPHA)
+        pygame.draw.circle(surface, (255, 215, 0), (8, 8), 8)
+        pygame.draw.circle(surface, (218, 165, 32), (8, 8), 6)
+        return self._finish(surface), (-8, -8)
+
+    def _build_house(self, level):
+        size = 30 + (level - 1) * 10
+        roof_height = 20 + (level - 1) * 5
+        house_color = {
+            1: (139, 69, 19),
+            2: (160, 82, 45),
+            3: (178, 34, 34)
+        }[level]
+        level_text = self.font.render(f"Lv{level}", True, (255, 255, 255))
+
+        width = max(size + 10, level_text.get_width())
+        height = roof_height + size + 5 + level_text.get_height()
+        center_x, center_y = width // 2, roof_height + size // 2
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(surface, house_color, (center_x - size // 2, roof_height, size, size))
+        pygame.draw.polygon(surface, (165, 42, 42),
+                            [(center_x - size // 2 - 5, roof_height),
+                             (center_x + size // 2 + 5, roof_height),
+                             (center_x, 0)])
+        surface.blit(level_text, (center_x - level_text.get_width() // 2, roof_height + size + 5))
+        return self._finish(surface), (-center_x, -center_y)
+
+    def _build_farm(self, stage):
+        crop_height = 2 + stage
+        surface = pygame.Surface((30, 30), pygame.SRCALPHA)
+        surface.fill((205, 133, 63))
+        for i in range(3):
+            for j in range(3):
+                pygame.draw.line(surface, (154, 205, 50),
+                                 (5 + i * 10, 5 + j * 10),
+                                 (5 + i * 10, 5 - crop_height + j * 10), 2)
+        return self._finish(surface), (-15, -15)
+
+    def _build_monster(self, level):
+        # A level of None draws the body alone
+        level_text = self.font.render(f"Lvl {level}", True, (255, 255, 255)) if level is not None else None
+        width = max(50, level_text.get_width()) if level_text else 50
+        center_x = width // 2
+        surface = pygame.Surface((width, 76), pygame.SRCALPHA)
+        # The monster's centre sits at (center_x, 50)
+        pygame.draw.circle(surface, (150, 0, 150), (center_x, 50), 25)
+        pygame.draw.circle(surface, (255, 0, 0), (center_x - 7, 45), 5)
+        pygame.draw.circle(surface, (255, 0, 0), (center_x + 7, 45), 5)
+        if level_text:
+            surface.blit(level_text, (center_x - level_text.get_width() // 2, 0))
+        return self._finish(surface), (-center_x, -50)
+
+    def _build_bar(self, width, filled, back_color, front_color):
+        surface = pygame.Surface((width, 4))
+        surface.fill(back_color)
+        if filled > 0:
+            surface.fill(front_color, (0, 0, filled, 4))
+        return self._finish(surface)
+
+    def _get_fixed(self, key, build):
+        # Keys from a small fixed set, such as quantised HP bars
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.sprites[key] = build()
+        return sprite
+
+    def _get_villager(self, key, build):
+        sprite = self.villagers.get(key)
+        if sprite is None:
+            sprite = self.villagers[key] = build()
+        return sprite
+
+    def keep(self, characters):
+        # Once far more villager sprites are cached than there are villagers, drop the dead ones
+        if len(self.villagers) <= 2 * len(characters) + 32:
+            return
+        alive = set()
+        for character in characters:
+            alive.add(("character", character.color))
+            alive.add(("name", character.name))
+        self.villagers = {key: sprite for key, sprite in self.villagers.items() if key in alive}
+
+    def _get(self, key, build):
+        cached = self.cached
+        sprite = cached.get(key)
+        if sprite is None:
+            sprite = cached[key] = build()
+            if len(cached) > self.max_cached:
+                cached.popitem(last=False)
+        else:
+            cached.move_to_end(key)
+        return sprite
+
+    def house(self, level):
+        return self.sprites["house", level]
+
+    def farm(self, farm):
+        return self.sprites["farm", min(3, 3 * farm.growth // farm.growth_time)]
+
+    def monster(self, level):
+        return self._get(("monster", level), lambda: self._build_monster(level))
+
+    def monster_hp_bar(self, monster):
+        filled = max(0, min(30, int(monster.hp / monster.max_hp * 30)))
+        return self._get_fixed(("monster_hp", filled),
+                         lambda: (self._build_bar(30, filled, (255, 0, 0), (0, 255, 0)), (-15, -35)))
+
+    def character(self, color):
+        def build():
+            surface = pygame.Surface((20, 20))
+            surface.fill(color)
+            return self._finish(surface), (-10, -10)
+        return self._get_villager(("character", color), build)
+
+    def character_hp_bar(self, character):
+        filled = max(0, min(50, int(character.hp / character.max_hp * 50)))
+        return self._get_fixed(("character_hp", filled),
+                         lambda: (self._build_bar(50, filled, (100, 0, 0), (255, 0, 0)), (-25, -50)))
+
+    def name_label(self, name):
+        def build():
+            text = self.font.render(name, True, (255, 255, 255))
+            return self._finish(text), (-(text.get_width() // 2), -65)
+        return self._get_villager(("name", name), build)
+
+    def effect_text(self, text, color):
+        # Shared by every effect showing the same text; callers set the alpha right before blitting
+        return self._get(("effect", text, color),
+                         lambda: self.effect_font.render(text, True, color))
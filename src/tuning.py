@@ -0,0 +1,191 @@
+import argparse
+import json
+import math
+import random
+from .world import World
+from .roster import Roster
+
+# name -> (low, high, log scale); "biases.*" entries tune the choose_action multipliers
+SEARCH_SPACE = {
+    "learning_rate": (0.01, 0.5, True),
+    "discount_factor": (0.5, 0.99, False),
+    "epsilon": (0.02, 0.5, True),
+    "epsilon_decay": (0.99, 0.99995, False),
+    "min_epsilon": (0.005, 0.1, True),
+    "biases.hungry_harvest": (0.8, 3.0, False),
+    "biases.hungry_farm": (0.8, 3.0, False),
+    "biases.low_wood_chop": (0.8, 3.0, False),
+    "biases.build": (0.8, 3.0, False),
+    "biases.upgrade": (0.8, 3.0, False),
+    "biases.food_farm": (0.8, 3.0, False),
+}
+
+
+def sample_config(rng, space=SEARCH_SPACE):
+    config = {}
+    for name, (low, high, log) in space.items():
+        if log:
+            config[name] = math.exp(rng.uniform(math.log(low), math.log(high)))
+        else:
+            config[name] = rng.uniform(low, high)
+    return config
+
+
+def character_config(config):
+    # Flat "biases.build" keys become the nested overrides Roster expects
+    result = {}
+    for name, value in config.items():
+        if "." in name:
+            group, key = name.split(".", 1)
+            result.setdefault(group, {})[key] = value
+        else:
+            result[name] = value
+    return result
+
+
+class EpisodeWorld(World):
+    # Keeps the rewards of characters that have died so the whole village can be scored
+    def __init__(self):
+        super().__init__()
+        self.log_actions = False
+        self.dead_reward = 0.0
+
+    def handle_death(self, character):
+        self.dead_reward += character.total_reward
+        super().handle_death(character)
+
+
+class Episode:
+    # One configuration on one seed, stepped in chunks so it can be resumed with more budget
+    def __init__(self, config, seed, villagers=3):
+        self.config = config
+        state = random.getstate()
+        random.seed(seed)
+        self.world = EpisodeWorld()
+        self.world.populate(Roster(size=villagers, seed=seed, character_config=character_config(config)))
+        self.random_state = random.getstate()
+        random.setstate(state)
+        self.frames = 0
+
+    def run(self, frames):
+        # Episodes share the global random module, so each one keeps its own stream
+        world = self.world
+        state = random.getstate()
+        random.setstate(self.random_state)
+        stepped = 0
+        while stepped < frames and not world.game_over:
+            world.step()
+            stepped += 1
+        self.random_state = random.getstate()
+        random.setstate(state)
+        self.frames += stepped
+        return stepped
+
+    def score(self, budget, reward_weight):
+        # Survival as a fraction of the budget, plus a small share of the reward per villager
+        world = self.world
+        reward = world.dead_reward + sum(c.total_reward for c in world.characters)
+        created = max(1, world.roster.created)
+        survival = min(world.game_time, budget) / budget
+        return survival + reward_weight * reward / created / budget
+
+
+class Tuner:
+    # Successive halving over resumable episodes, and Hyperband brackets on top of it
+    def __init__(self, min_frames=600, max_frames=60 * 60 * 10, eta=3, seeds=(0, 1),
+                 villagers=3, reward_weight=1.0, space=SEARCH_SPACE, seed=None, log=print):
+        self.min_frames = min_frames
+        self.max_frames = max_frames
+        self.eta = eta
+        self.seeds = list(seeds)
+        self.villagers = villagers
+        self.reward_weight = reward_weight
+        self.space = space
+        self.rng = random.Random(seed)
+        self.log = log or (lambda *args: None)
+        self.frames_spent = 0
+        self.configs_tried = 0
+        self.results = []  # (score, frames budget reached, config)
+
+    def evaluate(self, candidates, budget):
+        # Bring every candidate's episodes up to budget frames, resuming where they stopped
+        scores = []
+        for episodes in candidates:
+            total = 0.0
+            for episode in episodes:
+                self.frames_spent += episode.run(budget - episode.frames)
+                total += episode.score(budget, self.reward_weight)
+            scores.append(total / len(episodes))
+        return scores
+
+    def successive_halving(self, count, min_frames):
+        configs = [sample_config(self.rng, self.space) for _ in range(count)]
+        self.configs_tried += count
+        candidates = [[Episode(config, seed, self.villagers) for seed in self.seeds] for config in configs]
+        budget = min_frames
+        while True:
+            scores = self.evaluate(candidates, budget)
+            ranked = sorted(zip(scores, range(len(candidates))), reverse=True)
+            self.log(f"  {len(candidates)} configs at {budget} frames, best score {ranked[0][0]:.3f}")
+            if budget >= self.max_frames or len(candidates) == 1:
+                break
+            # Only the top 1/eta get more frames
+            keep = max(1, len(candidates) // self.eta)
+            for score, i in ranked[keep:]:
+                self.results.append((score, budget, candidates[i][0].config))
+            candidates = [candidates[i] for _, i in ranked[:keep]]
+            budget = min(self.max_frames, budget * self.eta)
+        for score, i in ranked:
+            self.results.append((score, budget, candidates[i][0].config))
+        return ranked[0][0], candidates[ranked[0][1]][0].config
+
+    def hyperband(self):
+        s_max = int(math.log(self.max_frames / self.min_frames, self.eta) + 1e-9)
+        for s in range(s_max, -1, -1):
+            count = int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s))
+            min_frames = int(self.max_frames * self.eta ** -s)
+            self.log(f"bracket {s}: {count} configs from {min_frames} frames")
+            self.successive_halving(count, min_frames)
+        return self.best()
+
+    def best(self):
+        # Only configurations that reached the full budget count as finished
+        finished = [result for result in self.results if result[1] >= self.max_frames]
+        return max(finished or self.results, key=lambda result: result[0])
+
+    def grid_cost(self):
+        # Frames a full-length evaluation of every configuration tried would budget (villages may die sooner)
+        return self.configs_tried * len(self.seeds) * self.max_frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune Character learning parameters with successive halving")
+    parser.add_argument("--min-frames", type=int, default=600)
+    parser.add_argument("--max-frames", type=int, default=60 * 60 * 10)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--seeds", type=int, default=2, help="episodes per configuration")
+    parser.add_argument("--villagers", type=int, default=3)
+    parser.add_argument("--configs", type=int, default=81, help="configurations for successive halving")
+    parser.add_argument("--hyperband", action="store_true",
+                        help="run every Hyperband bracket instead; explores more, but the longer brackets save far less")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="write the best configuration as a roster character_config")
+    args = parser.parse_args()
+
+    tuner = Tuner(args.min_frames, args.max_frames, args.eta, range(args.seeds), args.villagers, seed=args.seed)
+    if args.hyperband:
+        tuner.hyperband()
+    else:
+        tuner.successive_halving(args.configs, args.min_frames)
+    score, frames, config = tuner.best()
+    print(f"best score {score:.3f} at {frames} frames")
+    print(json.dumps(config, indent=2))
+    print(f"simulated {tuner.frames_spent} frames for {tuner.configs_tried} configs; full-length runs of "
+          f"all of them would budget {tuner.grid_cost()} ({tuner.grid_cost() / max(1, tuner.frames_spent):.1f}x)")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"character_config": character_config(config)}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,108 +1,275 @@
 import random
 import math
-import pygame
-import datetime
-import os
+import copy
+import heapq
+import itertools
 from .enums import Resource, Action
-from .animation import Animation
+from .character import choose_actions
+from .effects import EffectSystem
 from .buildings import House
+from .farms import FarmField
 from .monster import Monster
-
-# Define take_screenshot as a standalone function at the module level
-def take_screenshot(screen):
-    # Create screenshots directory if it doesn't exist
-    if not os.path.exists("screenshots"):
-        os.makedirs("screenshots")
-        
-    timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-    filename = f"screenshots/screenshot-{timestamp}.png"
-    pygame.image.save(screen, filename)
-    print(f"Screenshot saved as {filename}")
+from .roster import Roster
+from .grid import Grid
+from .flowfield import FlowField
+from .regen import RegenMap
+from .navigation import Navigator
+from .difficulty import DifficultyEngine
 
 class World:
-    def __init__(self):
+    def __init__(self, width=800, height=700):
         self.resources = {
             Resource.WOOD: 100,
             Resource.FOOD: 50,
         }
         self.characters = []
-        self.width = 800
-        self.height = 700
+        # Predicted deaths as (frame, order, hp_version, character); entries whose version no
+        # longer matches were made stale by a later HP change
+        self.deaths = []
+        self.death_order = itertools.count()
+        self.roster = None
+        self.width = width
+        self.height = height
         self.ui_height = 160
         self.game_area_start = self.ui_height
         self.tree_positions = []
         self.food_positions = []
         self.houses = []
-        self.farm_positions = []
-        self.animations = []
+        self.farms = FarmField()
+        self.effects = EffectSystem()  # Floating text, aged in simulation frames
         self.max_trees = 20
         self.max_food = 10
-        self.resource_regen_timer = 0
-        self.resource_regen_interval = 300
         self.game_speed = 1
         self.max_speed = 5
         self.min_house_distance = 80
         self.error_message_cooldown = 0
         self.monsters = []
-        self.monster_spawn_timer = 0
-        self.monster_spawn_interval = 300  # 5 seconds at 60 FPS
-        self.max_monsters = 5
+        # Shared navigation grid; monsters follow a flow field towards the nearest character
+        self.grid = Grid(self.width, self.height, 40, self.game_area_start)
+        self.flow_field = FlowField(self.grid)
+        # HP regeneration near houses, looked up per character from a fine-grained grid
+        self.regen_map = RegenMap(Grid(self.width, self.height, 10, self.game_area_start),
+                                  self.min_house_distance)
+        # Characters walk around houses and farms along cached A* paths
+        self.navigator = Navigator(self.width, self.height, self.game_area_start)
+        # Trees and wild food grow per grid cell and are placed in the world when looked for.
+        # Imported here so that importing the world does not load NumPy.
+        from .ecology import Ecology
+        self.ecology = Ecology(self.grid)
+        self.difficulty = DifficultyEngine()  # Decides when monsters spawn and how strong they are
+        self.max_attack_range = 40  # Largest Character.attack_range, bounds neighbour queries
+        self.monster_spawning = True  # Disabled when an arena spawns monsters for us
+        self.log_actions = True
+        self.auto_decide = True  # Idle characters pick their own actions; an env wrapper turns this off
+        self.metrics = None  # Optional MetricsRecorder sampled at the end of every step
+        self.learner = None  # Optional ReplayLearner that takes over the Q-updates
+        self.memory = None  # Optional MemoryTracker; step() then measures each phase
+        self.lod = None  # Optional LevelOfDetail; far-away monsters and farms then update in bulk
+        self.live_state = None  # Optional LiveStateWriter that shares every tick with other processes
         self.game_over = False
         self.game_time = 0  # Time in frames (60 frames = 1 second)
         self.paused = False
         self.generate_resources()
-        self.ui_font = pygame.font.Font(None, 24)
-        self.title_font = pygame.font.Font(None, 36)
-        # Rearrange speed control positions
-        button_width = 20
-        button_height = 20
-        button_y = 55
-        self.speed_label_pos = (500, button_y)
-        self.decrease_button = pygame.Rect(560, button_y, button_width, button_height)
-        self.speed_value_pos = (590, button_y)
-        self.increase_button = pygame.Rect(630, button_y, button_width, button_height)
         self.show_help = False
-        self.help_button = pygame.Rect(self.width - 70, 10, 60, 30)  # x, y, width, height
         self.help_page = 1
         self.total_help_pages = 3
+        self.renderer = None  # Created on first draw so headless runs never load pygame
+
+        # Per-action handlers: starting an action, and finishing it once gathering is done
+        self.action_starts = {
+            Action.CHOP_TREE: self.start_chop_tree,
+            Action.HARVEST_FOOD: self.start_harvest_food,
+            Action.BUILD_HOUSE: self.start_build_house,
+            Action.UPGRADE_HOUSE: self.start_upgrade_house,
+            Action.FARM_FOOD: self.start_farm_food,
+        }
+        self.action_finishes = {
+            Action.CHOP_TREE: self.finish_chop_tree,
+            Action.HARVEST_FOOD: self.finish_harvest_food,
+            Action.BUILD_HOUSE: self.finish_nothing,
+            Action.UPGRADE_HOUSE: self.finish_upgrade_house,
+            Action.FARM_FOOD: self.finish_farm_food,
+        }
 
     def add_character(self, character):
+        character.slot = len(self.characters)
+        character.born = self.game_time
         self.characters.append(character)
+        character.adopt(self)
+        self.refresh_hp_rate(character)
+
+    def remove_character(self, character):
+        # Swap-remove: move the last character into the freed slot
+        last = self.characters.pop()
+        if last is not character:
+            self.characters[character.slot] = last
+            last.slot = character.slot
+
+    def add_effect(self, text, x, y, color, anchor=None):
+        return self.effects.add(text, x, y, color, self.game_time, anchor)
+
+    def populate(self, roster=None):
+        self.roster = roster if roster is not None else Roster()
+        self.roster.populate(self)
+
+    # The phases of step() in order, used when a MemoryTracker measures them one by one
+    step_phases = (
+        "update_needs", "check_game_over", "regenerate_resources", "update_farms",
+        "update_decisions", "update_characters", "update_monsters", "update_game_time",
+        "update_effects", "update_population", "record_metrics", "publish_live_state",
+    )
+
+    def step(self):
+        # Advance the simulation by a single frame
+        if self.memory is not None:
+            self.memory.step(self)
+            return
+        self.update_needs()
+        self.check_game_over()
+        self.regenerate_resources()
+        self.update_farms()
+        self.update_decisions()
+        self.update_characters()
+        self.update_monsters()
+        self.update_game_time()
+        self.update_effects()
+        self.update_population()
+        self.record_metrics()
+        self.publish_live_state()
+
+    def record_metrics(self):
+        if self.metrics is not None:
+            self.metrics.record(self)
+
+    def publish_live_state(self):
+        if self.live_state is not None:
+            self.live_state.publish(self)
+
+    def update_population(self):
+        if self.roster is not None:
+            self.roster.update(self)
+
+    def update_needs(self):
+        # HP is never stepped; only the deaths predicted for this frame are looked at
+        deaths = self.deaths
+        while deaths and deaths[0][0] <= self.game_time:
+            _, _, version, character = heapq.heappop(deaths)
+            if version != character.hp_version or character.is_dead:
+                continue
+            if character.hp > 0:
+                # Rounding left a sliver of HP, it runs out next frame
+                heapq.heappush(deaths, (self.game_time + 1, next(self.death_order), version, character))
+                continue
+            character.is_dead = True
+            self.handle_death(character)
+
+    def schedule_death(self, character):
+        # Called whenever a character's HP or its rate changes
+        tick = character.death_tick()
+        if tick is None:
+            return
+        deaths = self.deaths
+        if len(deaths) > 64 + 8 * len(self.characters):
+            # Mostly stale entries far in the future; drop them rather than wait for their frame
+            deaths[:] = [entry for entry in deaths if entry[2] == entry[3].hp_version and not entry[3].is_dead]
+            heapq.heapify(deaths)
+        heapq.heappush(deaths, (tick, next(self.death_order), character.hp_version, character))
+
+    def refresh_hp_rate(self, character):
+        # Decay everywhere, offset by the regeneration of the nearest houses
+        character.set_hp_rate(self.regen_map.at(character.x, character.y) - character.hp_decay)
+
+    def handle_death(self, character):
+        self.add_effect(f"{character.name} has died!", character.x, character.y, (255, 0, 0))
+        self.remove_character(character)
+        if self.learner is not None:
+            self.learner.release(character)
+
+    def is_decision_frame(self):
+        return self.game_time % 60 == 0
+
+    def update_decisions(self):
+        if self.is_decision_frame():
+            if self.learner is not None:
+                self.learner.on_decision(self.characters)
+            if not self.auto_decide:
+                return
+            self.decide_all([character for character in self.characters if character.action_state == "idle"])
+        else:
+            self.update_actions()
+
+    def decide_all(self, characters):
+        # Choose for every idle character at once, then start the actions grouped by type
+        groups = {}
+        for character, action in zip(characters, choose_actions(characters)):
+            groups.setdefault(action, []).append(character)
+        for action, group in groups.items():
+            for character in group:
+                reward = self.start_action(character, action)
+                if self.log_actions:
+                    print(f"{character.name} performed {action.value}, got reward: {reward}")
+
+    def start_action(self, character, action):
+        character.current_action = action
+        reward = self.action_starts[action](character)
+        # Building has always scored itself without a Q-update (see start_build_house)
+        if action is not Action.BUILD_HOUSE:
+            self.learn(character, action, reward)
+        return reward
+
+    def learn(self, character, action, reward):
+        if self.learner is None:
+            character.learn(action, reward)
+        else:
+            character.remember(action, reward)
+            self.learner.record(character, action, reward)
+
+    def update_actions(self):
+        # Ongoing actions as a small state machine: move, gather, finish
+        for character in self.characters:
+            action = character.current_action
+            if action is None:
+                continue
+            state = character.action_state
+            if state == "moving":
+                arrived = character.move_to_target()
+                self.refresh_hp_rate(character)
+                if arrived:
+                    character.action_state = "gathering"
+                    character.gathering_time = 0
+            elif state == "gathering":
+                character.gathering_time += 1
+                if character.gathering_time >= character.gathering_duration:
+                    reward = self.action_finishes[action](character)
+                    character.pending_reward += reward
+                    character.total_reward += reward
+                    if self.learner is not None:
+                        # Only the replay learner sees rewards for finished actions
+                        self.learner.record(character, action, reward)
+                    character.current_target = None
+                    character.action_state = "idle"
+            else:
+                # A finished action starts over until the next decision frame; nobody else sees
+                # this reward, so it is collected like the reward of a finished action
+                character.pending_reward += self.start_action(character, action)
 
     def generate_resources(self):
-        margin = 50
-        for _ in range(self.max_trees):
-            x = random.randint(margin, self.width - margin)
-            y = random.randint(self.game_area_start + margin, self.height - margin)
-            self.tree_positions.append((x, y))
-            
-        for _ in range(self.max_food):
-            x = random.randint(margin, self.width - margin)
-            y = random.randint(self.game_area_start + margin, self.height - margin)
-            self.food_positions.append((x, y))
+        self.ecology.populate(self)
 
     def regenerate_resources(self):
-        self.resource_regen_timer += 1
-        if self.resource_regen_timer >= self.resource_regen_interval:
-            self.resource_regen_timer = 0
-            
-            if len(self.tree_positions) < self.max_trees and self.resources[Resource.WOOD] < 100:
-                margin = 50
-                x = random.randint(margin, self.width - margin)
-                y = random.randint(self.game_area_start + margin, self.height - margin)
-                self.tree_positions.append((x, y))
-                self.resources[Resource.WOOD] += 1
-                self.animations.append(
-                    Animation("New Tree", x, y, (0, 255, 0)))
-            
-            if len(self.food_positions) < self.max_food and self.resources[Resource.FOOD] < 50:
-                margin = 50
-                x = random.randint(margin, self.width - margin)
-                y = random.randint(self.game_area_start + margin, self.height - margin)
-                self.food_positions.append((x, y))
-                self.resources[Resource.FOOD] += 1
-                self.animations.append(
-                    Animation("New Food", x, y, (255, 255, 0)))
+        self.ecology.update(self)
+
+    def update_farms(self):
+        # Ripe farms drop fresh food next to them while there is room for it
+        for farm in self.farms.update():
+            if len(self.food_positions) >= self.max_food:
+                break
+            x = farm.x + random.randint(-25, 25)
+            y = max(self.game_area_start, farm.y + random.randint(-25, 25))
+            self.food_positions.append((x, y))
+            self.resources[Resource.FOOD] += 1
+            farm.growth = 0
+            self.add_effect("Harvest Ready", x, y, (154, 205, 50))
 
     def find_nearest_resource(self, character, resource_positions):
         if not resource_positions:
@@ -116,19 +283,49 @@ class World:
             self.tree_positions.remove(position)
         elif resource_type == "food":
             self.food_positions.remove(position)
+        self.ecology.consume(position, resource_type)
 
-    def find_nearby_house(self, character, check_distance=None):
-        if check_distance is None:
-            check_distance = self.min_house_distance
-        
+    def house_at(self, position):
         for house in self.houses:
-            dx = house.x - character.x
-            dy = house.y - character.y
-            distance = math.sqrt(dx**2 + dy**2)
-            if distance <= check_distance:
+            if (house.x, house.y) == position:
                 return house
         return None
 
+    def add_house(self, house):
+        self.houses.append(house)
+        self.update_house_footprint(house)
+
+    def update_house_footprint(self, house):
+        half_size = (30 + (house.level - 1) * 10) / 2
+        self.grid.block_rect(house.x - half_size, house.y - half_size,
+                             house.x + half_size, house.y + half_size)
+        self.regen_map.add_house(house)
+        self.navigator.add_house(house)
+        for character in self.characters:
+            self.refresh_hp_rate(character)
+
+    def find_upgradable_house(self, character):
+        # Nearest house the character can afford to upgrade
+        wood = character.inventory[Resource.WOOD]
+        best, best_distance = None, float('inf')
+        for house in self.houses:
+            cost = house.upgrade_cost()
+            if cost is not None and cost <= wood:
+                distance = (house.x - character.x) ** 2 + (house.y - character.y) ** 2
+                if distance < best_distance:
+                    best, best_distance = house, distance
+        return best
+
+    def upgrade_house(self, character, house):
+        cost = house.upgrade_cost()
+        if cost is None or character.inventory[Resource.WOOD] < cost:
+            return False
+        character.inventory[Resource.WOOD] -= cost
+        house.level += 1
+        self.update_house_footprint(house)
+        self.add_effect(f"House Upgraded to Lv{house.level}!", house.x, house.y, (0, 255, 0))
+        return True
+
     def can_build_house(self, x, y):
         # Check if too close to other houses
         for house in self.houses:
@@ -139,492 +336,215 @@ class World:
                 return False
         return True
 
-    def perform_action(self, character, action):
-        reward = 0
-        
-        if character.action_state != "idle":
-            if character.update():
-                if action == Action.CHOP_TREE:
-                    if character.current_target in self.tree_positions:
-                        character.inventory[Resource.WOOD] += 1
-                        self.resources[Resource.WOOD] -= 1
-                        reward = 5 - ((character.max_hp - character.hp) / character.max_hp * 2)
-                        self.remove_resource(character.current_target, "tree")
-                        
-                elif action == Action.HARVEST_FOOD:
-                    if character.current_target in self.food_positions:
-                        character.inventory[Resource.FOOD] += 1
-                        self.resources[Resource.FOOD] -= 1
-                        hp_bonus = (character.max_hp - character.hp) / character.max_hp * 5
-                        reward = 3 + hp_bonus
-                        character.hp = min(character.max_hp, character.hp + character.hp_per_food)
-                        self.remove_resource(character.current_target, "food")
-                
-                elif action == Action.FARM_FOOD:
-                    if character.inventory[Resource.FOOD] >= 1:
-                        character.inventory[Resource.FOOD] -= 1
-                        character.inventory[Resource.FOOD] += 2
-                        self.farm_positions.append((character.x, character.y))
-                        reward = 8
-                
-                character.current_target = None
-                character.action_state = "idle"
-            return reward
-        
-        character.current_action = action
-        
-        if action == Action.CHOP_TREE:
-            if self.tree_positions:
-                target = self.find_nearest_resource(character, self.tree_positions)
-                if target:
-                    character.current_target = target
-                    character.action_state = "moving"
-                else:
-                    reward = -2
-                
-        elif action == Action.HARVEST_FOOD:
-            if self.food_positions:
-                target = self.find_nearest_resource(character, self.food_positions)
-                if target:
-                    character.current_target = target
-                    character.action_state = "moving"
-                else:
-                    reward = -2
-            else:
-                reward = -2
-                
-        elif action == Action.BUILD_HOUSE:
-            if character.inventory[Resource.WOOD] >= 5:
-                # Check if location is valid before building
-                if self.can_build_house(character.x, character.y):
-                    character.inventory[Resource.WOOD] -= 5
-                    self.houses.append(House(character.x, character.y))
-                    character.inventory[Resource.HOUSE] += 1
-                    self.animations.append(
-                        Animation("House Built!", character.x, character.y, (0, 255, 0)))
-                    return 10
-                else:
-                    # Only show error message if cooldown is 0
-                    if self.error_message_cooldown <= 0:
-                        self.animations.append(
-                            Animation("Too close to other houses!", character.x, character.y, (255, 0, 0)))
-                        self.error_message_cooldown = 60  # Set cooldown (1 second at 60 FPS)
-                    return -1
-            else:
-                reward = -1
+    def start_moving(self, character, target):
+        self.navigator.sync_farms(self.farms)
+        character.current_target = target
+        character.set_path(self.navigator.route(character.x, character.y, target))
+        character.action_state = "moving"
 
-        elif action == Action.FARM_FOOD:
-            if character.inventory[Resource.FOOD] >= 1:
-                character.current_target = (character.x, character.y)
-                character.action_state = "gathering"
-                self.gathering_time = 0
-            else:
-                reward = -1
+    def start_chop_tree(self, character):
+        self.ecology.materialize(self, "tree", character.x, character.y)
+        target = self.find_nearest_resource(character, self.tree_positions) if self.tree_positions else None
+        if target:
+            self.start_moving(character, target)
+            return 0
+        return -2 if self.tree_positions else 0
 
-        character.learn(action, reward)
-        return reward
+    def start_harvest_food(self, character):
+        self.ecology.materialize(self, "food", character.x, character.y)
+        target = self.find_nearest_resource(character, self.food_positions) if self.food_positions else None
+        if target:
+            self.start_moving(character, target)
+            return 0
+        return -2
+
+    def start_build_house(self, character):
+        if character.inventory[Resource.WOOD] < 5:
+            self.learn(character, Action.BUILD_HOUSE, -1)
+            return -1
+        # Check if location is valid before building
+        if self.can_build_house(character.x, character.y):
+            character.inventory[Resource.WOOD] -= 5
+            self.add_house(House(character.x, character.y))
+            character.inventory[Resource.HOUSE] += 1
+            self.add_effect("House Built!", character.x, character.y, (0, 255, 0))
+            return 10
+        # Only show error message if cooldown is 0
+        if self.error_message_cooldown <= 0:
+            self.add_effect("Too close to other houses!", character.x, character.y, (255, 0, 0))
+            self.error_message_cooldown = 60  # Set cooldown (1 second at 60 FPS)
+        return -1
+
+    def start_upgrade_house(self, character):
+        house = self.find_upgradable_house(character)
+        if house:
+            self.start_moving(character, (house.x, house.y))
+            return 0
+        return -1
+
+    def start_farm_food(self, character):
+        if character.inventory[Resource.FOOD] >= 1:
+            character.current_target = (character.x, character.y)
+            character.action_state = "gathering"
+            return 0
+        return -1
+
+    def finish_chop_tree(self, character):
+        if character.current_target not in self.tree_positions:
+            return 0
+        character.inventory[Resource.WOOD] += 1
+        self.resources[Resource.WOOD] -= 1
+        self.remove_resource(character.current_target, "tree")
+        return 5 - ((character.max_hp - character.hp) / character.max_hp * 2)
+
+    def finish_harvest_food(self, character):
+        if character.current_target not in self.food_positions:
+            return 0
+        character.inventory[Resource.FOOD] += 1
+        self.resources[Resource.FOOD] -= 1
+        hp_bonus = (character.max_hp - character.hp) / character.max_hp * 5
+        character.hp = min(character.max_hp, character.hp + character.hp_per_food)
+        self.remove_resource(character.current_target, "food")
+        return 3 + hp_bonus
+
+    def finish_upgrade_house(self, character):
+        # The house chosen in start_upgrade_house, not just any house nearby
+        house = self.house_at(character.current_target)
+        if house and self.upgrade_house(character, house):
+            return 12
+        return 0
+
+    def finish_farm_food(self, character):
+        if character.inventory[Resource.FOOD] < 1:
+            return 0
+        character.inventory[Resource.FOOD] -= 1
+        character.inventory[Resource.FOOD] += 2
+        self.farms.plant(character.x, character.y)
+        return 8
+
+    def finish_nothing(self, character):
+        return 0
 
     def update_characters(self):
         # Update error message cooldown
         if self.error_message_cooldown > 0:
             self.error_message_cooldown -= 1
-        
-        # Remove dead characters
-        self.characters = [char for char in self.characters if not char.is_dead]
-        
-        # Update remaining characters
-        for character in self.characters:
-            nearby_house = self.find_nearby_house(character)
-            if nearby_house:
-                hp_regen = nearby_house.level_benefits[nearby_house.level]["hp_regen"]
-                character.hp = min(character.max_hp, character.hp + hp_regen)
-        
-        # Update attack cooldown
-        for char in self.characters:
-            char.update_attack_cooldown()
-        
+
+        # HP regeneration and attack cooldowns follow from game_time, nothing to step here
+
         # Check if all characters are dead
-        if all(char.is_dead for char in self.characters):
+        if not self.characters:
             self.game_over = True
 
+    def get_renderer(self):
+        if self.renderer is None:
+            from .renderer import WorldRenderer
+            self.renderer = WorldRenderer(self)
+        return self.renderer
+
     def draw(self, screen):
-        # Draw game background
-        pygame.draw.rect(screen, (50, 100, 50), 
-                        (0, self.game_area_start, self.width, self.height - self.game_area_start))
-        
-        # Draw grid lines
-        grid_spacing = 50
-        for x in range(0, self.width, grid_spacing):
-            pygame.draw.line(screen, (60, 110, 60), 
-                           (x, self.game_area_start), 
-                           (x, self.height))
-        for y in range(self.game_area_start, self.height, grid_spacing):
-            pygame.draw.line(screen, (60, 110, 60), 
-                           (0, y), 
-                           (self.width, y))
-        
-        # Draw resources and entities
-        for x, y in self.tree_positions:
-            self.draw_tree(screen, x, y)
-        for x, y in self.food_positions:
-            self.draw_food(screen, x, y)
-        for house in self.houses:
-            self.draw_house(screen, house)
-        for x, y in self.farm_positions:
-            self.draw_farm(screen, x, y)
-            
-        # Draw characters
-        for character in self.characters:
-            character.draw(screen)
-            
-        # Draw animations
-        self.animations = [anim for anim in self.animations if anim.lifetime > 0]
-        for animation in self.animations:
-            animation.update()
-            animation.draw(screen)
-            
-        # Draw monsters
-        for monster in self.monsters:
-            monster.draw(screen)
-            
-        # Draw UI
-        self.draw_ui(screen)
-        
-        # Draw help button
-        self.draw_help_button(screen)
-        
-        if self.show_help:
-            self.draw_help_overlay(screen)
-        
-        # If game is over, draw overlay and final time
-        if self.game_over:
-            # Semi-transparent overlay
-            overlay = pygame.Surface((self.width, self.height))
-            overlay.fill((0, 0, 0))
-            overlay.set_alpha(128)
-            screen.blit(overlay, (0, 0))
-            
-            # Game Over text
-            game_over_font = pygame.font.Font(None, 96)
-            game_over_text = game_over_font.render("GAME OVER!", True, (255, 0, 0))
-            text_x = self.width // 2 - game_over_text.get_width() // 2
-            text_y = self.height // 2 - game_over_text.get_height()
-            screen.blit(game_over_text, (text_x, text_y))
-            
-            # Survival time text
-            time_font = pygame.font.Font(None, 64)
-            time_text = time_font.render(f"Survival Time: {self.format_time()}", True, (255, 255, 255))
-            time_x = self.width // 2 - time_text.get_width() // 2
-            time_y = text_y + game_over_text.get_height() + 20
-            screen.blit(time_text, (time_x, time_y))
-
-    def draw_tree(self, screen, x, y):
-        trunk_color = (139, 69, 19)
-        leaves_color = (34, 139, 34)
-        
-        pygame.draw.rect(screen, trunk_color, (x - 5, y, 10, 20))
-        pygame.draw.circle(screen, leaves_color, (x, y - 10), 15)
+        self.get_renderer().draw(self, screen)
 
-    def draw_food(self, screen, x, y):
-        pygame.draw.circle(screen, (255, 215, 0), (x, y), 8)
-        pygame.draw.circle(screen, (218, 165, 32), (x, y), 6)
+    def snapshot(self):
+        # Copy of everything draw() reads, so another thread can render it while we keep ticking
+        self.get_renderer()  # Shared with the snapshot, so create it here rather than on the render thread
+        snapshot = copy.copy(self)
+        snapshot.resources = dict(self.resources)
+        snapshot.tree_positions = list(self.tree_positions)
+        snapshot.food_positions = list(self.food_positions)
+        snapshot.farms = self.farms.snapshot()
+        snapshot.houses = [copy.copy(house) for house in self.houses]
+        snapshot.characters = [copy.copy(character) for character in self.characters]
+        snapshot.monsters = [copy.copy(monster) for monster in self.monsters]
+        # HP and cooldowns are read off the clock, which stops at the snapshot's frame
+        for entity in snapshot.characters + snapshot.monsters:
+            entity.clock = snapshot
+        snapshot.effects = self.effects.snapshot()
+        return snapshot
 
-    def draw_house(self, screen, house):
-        base_size = 30
-        size_increase = 10
-        current_size = base_size + (house.level - 1) * size_increase
-        
-        house_color = {
-            1: (139, 69, 19),
-            2: (160, 82, 45),
-            3: (178, 34, 34)
-        }[house.level]
-        
-        pygame.draw.rect(screen, house_color, 
-                        (house.x - current_size/2, 
-                         house.y - current_size/2, 
-                         current_size, current_size))
-        
-        roof_height = 20 + (house.level - 1) * 5
-        pygame.draw.polygon(screen, (165, 42, 42),
-                          [(house.x - current_size/2 - 5, house.y - current_size/2),
-                           (house.x + current_size/2 + 5, house.y - current_size/2),
-                           (house.x, house.y - current_size/2 - roof_height)])
-        
-        font = pygame.font.Font(None, 20)
-        level_text = font.render(f"Lv{house.level}", True, (255, 255, 255))
-        screen.blit(level_text, (house.x - level_text.get_width()/2, 
-                                house.y + current_size/2 + 5))
-
-        # Add tooltip on hover
-        mouse_pos = pygame.mouse.get_pos()
-        house_rect = pygame.Rect(house.x - 20, house.y - 20, 40, 40)
-        
-        if house_rect.collidepoint(mouse_pos):
-            tooltip_lines = [
-                f"Level {house.level} House",
-                f"HP Recovery: {house.level_benefits[house.level]['hp_regen'] * 100}% per second"
-            ]
-            tooltip_font = pygame.font.Font(None, 20)
-            line_height = 20
-            
-            # Calculate tooltip dimensions
-            max_width = max(tooltip_font.size(line)[0] for line in tooltip_lines)
-            tooltip_width = max_width + 10
-            tooltip_height = (len(tooltip_lines) * line_height) + 10
-            
-            # Adjust position to keep tooltip on screen
-            tooltip_x = min(mouse_pos[0] + 10, self.width - tooltip_width - 10)
-            tooltip_y = min(mouse_pos[1] + 10, self.height - tooltip_height - 10)
-            
-            # Draw background for tooltip
-            tooltip_bg = pygame.Rect(tooltip_x, tooltip_y, tooltip_width, tooltip_height)
-            pygame.draw.rect(screen, (40, 40, 40), tooltip_bg)
-            pygame.draw.rect(screen, (100, 100, 100), tooltip_bg, 1)
-            
-            # Draw each line of text
-            for i, line in enumerate(tooltip_lines):
-                tooltip_surface = tooltip_font.render(line, True, (255, 255, 255))
-                screen.blit(tooltip_surface, 
-                           (tooltip_x + 5, 
-                            tooltip_y + 5 + (i * line_height)))
-
-    def draw_farm(self, screen, x, y):
-        farm_color = (205, 133, 63)
-        crop_color = (154, 205, 50)
-        
-        pygame.draw.rect(screen, farm_color, (x - 15, y - 15, 30, 30))
-        for i in range(3):
-            for j in range(3):
-                pygame.draw.line(screen, crop_color,
-                               (x - 10 + i*10, y - 10 + j*10),
-                               (x - 10 + i*10, y - 15 + j*10), 2)
-        
-        # Add tooltip on hover
-        mouse_pos = pygame.mouse.get_pos()
-        farm_rect = pygame.Rect(x - 15, y - 15, 30, 30)
-        
-        if farm_rect.collidepoint(mouse_pos):
-            tooltip_lines = [
-                "Farm",
-                "Produces: 2 Food",
-                "Cost: 1 Food"
-            ]
-            tooltip_font = pygame.font.Font(None, 20)
-            line_height = 20
-            
-            max_width = max(tooltip_font.size(line)[0] for line in tooltip_lines)
-            tooltip_width = max_width + 10
-            tooltip_height = (len(tooltip_lines) * line_height) + 10
-            
-            tooltip_x = min(mouse_pos[0] + 10, self.width - tooltip_width - 10)
-            tooltip_y = min(mouse_pos[1] + 10, self.height - tooltip_height - 10)
-            
-            tooltip_bg = pygame.Rect(tooltip_x, tooltip_y, tooltip_width, tooltip_height)
-            pygame.draw.rect(screen, (40, 40, 40), tooltip_bg)
-            pygame.draw.rect(screen, (100, 100, 100), tooltip_bg, 1)
-            
-            for i, line in enumerate(tooltip_lines):
-                tooltip_surface = tooltip_font.render(line, True, (255, 255, 255))
-                screen.blit(tooltip_surface, 
-                           (tooltip_x + 5, 
-                            tooltip_y + 5 + (i * line_height)))
-
-    def draw_ui(self, screen):
-        # Draw main UI background
-        ui_surface = pygame.Surface((self.width, self.ui_height))
-        ui_surface.fill((40, 40, 40))
-        screen.blit(ui_surface, (0, 0))
-        
-        # Draw instruction panel
-        instruction_height = 45
-        instruction_surface = pygame.Surface((self.width, instruction_height))
-        instruction_surface.fill((60, 60, 80))
-        screen.blit(instruction_surface, (0, 0))
-        
-        # Single line instruction
-        instructions = "Move mouse to desired location, then press 1 to plant tree | Press 2 to plant food"
-        
-        instruction_text = self.ui_font.render(instructions, True, (255, 255, 255))
-        padding = 20
-        screen.blit(instruction_text, (padding, 18))  # Centered vertically in the instruction panel
-        
-        # Draw world stats panel
-        stats_y = instruction_height
-        stats_height = 35
-        stats_surface = pygame.Surface((self.width, stats_height))
-        stats_surface.fill((50, 50, 50))
-        screen.blit(stats_surface, (0, stats_y))
-        
-        stats_padding = 20
-        world_stats = [
-            f"Trees: {self.resources[Resource.WOOD]}",
-            f"Food: {self.resources[Resource.FOOD]}",
-            f"Next Resource: {(self.resource_regen_interval - self.resource_regen_timer) // 60}s"
-        ]
-        
-        x_pos = stats_padding
-        stats_text_y = stats_y + 10
-        for i, text in enumerate(world_stats):
-            text_surface = self.ui_font.render(text, True, (255, 255, 255))
-            screen.blit(text_surface, (x_pos, stats_text_y))
-            # Add extra spacing before the speed text
-            x_pos += 200 if i == 2 else 150
-        
-        # Draw timer
-        timer_text = self.title_font.render(self.format_time(), True, (255, 255, 255))
-        timer_x = self.width - timer_text.get_width() - 20
-        screen.blit(timer_text, (timer_x, stats_text_y))
-        
-        # Draw character stats panel
-        char_stats_y = stats_y + stats_height
-        char_stats_height = 100
-        char_stats_surface = pygame.Surface((self.width, char_stats_height))
-        char_stats_surface.fill((30, 30, 30))
-        screen.blit(char_stats_surface, (0, char_stats_y))
-        
-        if len(self.characters) > 0:  # Only draw character stats if there are characters alive
-            x_spacing = self.width // len(self.characters)
-            for i, char in enumerate(self.characters):
-                if char.is_dead:
-                    continue
-                
-                x_pos = i * x_spacing + 20
-                y_pos = char_stats_y + 10
-                
-                # Character name with level
-                name_text = self.title_font.render(f"{char.name} (Lvl {char.level})", True, char.color)
-                screen.blit(name_text, (x_pos, y_pos))
-                
-                # Stats text
-                stats = [
-                    f"HP: {int(char.hp)}/{char.max_hp}",
-                    f"Attack: {char.attack_damage} Damage",
-                    f"Exp. to level up: {char.exp_to_next_level - char.exp}"
-                ]
-                
-                for j, stat in enumerate(stats):
-                    stat_text = self.ui_font.render(stat, True, (255, 255, 255))
-                    screen.blit(stat_text, (x_pos, y_pos + 25 + j * 20))
-        else:  # Show only game over text in the panel
-            game_over_text = self.title_font.render("GAME OVER!", True, (255, 0, 0))
-            text_x = self.width // 2 - game_over_text.get_width() // 2
-            text_y = char_stats_y + (char_stats_height // 2) - game_over_text.get_height() // 2
-            screen.blit(game_over_text, (text_x, text_y))
-        
-        # Draw speed controls in new order
-        # Draw "Speed:" label
-        speed_label = self.ui_font.render("Speed:", True, (255, 255, 255))
-        screen.blit(speed_label, self.speed_label_pos)
-        
-        # Draw decrease button (-)
-        pygame.draw.rect(screen, (100, 100, 100), self.decrease_button)
-        pygame.draw.rect(screen, (200, 200, 200), self.decrease_button, 2)
-        minus_text = self.ui_font.render("-", True, (255, 255, 255))
-        screen.blit(minus_text, (self.decrease_button.centerx - 4, self.decrease_button.centery - 8))
-        
-        # Draw speed value
-        speed_value = self.ui_font.render(f"{self.game_speed}x", True, (255, 255, 255))
-        screen.blit(speed_value, self.speed_value_pos)
-        
-        # Draw increase button (+)
-        pygame.draw.rect(screen, (100, 100, 100), self.increase_button)
-        pygame.draw.rect(screen, (200, 200, 200), self.increase_button, 2)
-        plus_text = self.ui_font.render("+", True, (255, 255, 255))
-        screen.blit(plus_text, (self.increase_button.centerx - 4, self.increase_button.centery - 8))
-
-    def handle_mouse_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if self.decrease_button.collidepoint(event.pos):
-                self.game_speed = max(1, self.game_speed - 1)
-            elif self.increase_button.collidepoint(event.pos):
-                self.game_speed = min(self.max_speed, self.game_speed + 1) 
-
-    def spawn_monster(self):
+    def spawn_monster(self, level=None, rng=random):
+        if level is None:
+            level = self.difficulty.monster_level(self)
         margin = 50
         # Spawn from edges of the screen
-        if random.choice([True, False]):
+        if rng.choice([True, False]):
             # Spawn from left or right
-            x = random.choice([margin, self.width - margin])
-            y = random.randint(self.game_area_start + margin, self.height - margin)
+            x = rng.choice([margin, self.width - margin])
+            y = rng.randint(self.game_area_start + margin, self.height - margin)
         else:
             # Spawn from top or bottom
-            x = random.randint(margin, self.width - margin)
-            y = random.choice([self.game_area_start + margin, self.height - margin])
+            x = rng.randint(margin, self.width - margin)
+            y = rng.choice([self.game_area_start + margin, self.height - margin])
         
-        self.monsters.append(Monster(x, y, self.game_time))
+        monster = Monster(x, y, self.difficulty.stats_for(level))
+        monster.clock = self
+        self.monsters.append(monster)
 
     def update_monsters(self):
         # Update existing method
-        self.monster_spawn_timer += 1
-        if self.monster_spawn_timer >= self.monster_spawn_interval and len(self.monsters) < self.max_monsters:
-            self.spawn_monster()
-            self.monster_spawn_timer = 0
+        if self.monster_spawning:
+            self.difficulty.update(self)
+        
+        if self.monsters or self.lod is not None:
+            self.flow_field.update(self.characters)
+        if self.lod is not None:
+            self.lod.update(self)
         
         # Update and handle monster-character interactions
         for monster in self.monsters[:]:  # Create a copy of the list for safe removal
+            if monster.dormant:
+                continue
             if monster.is_dead():
                 # Find characters in range to gain experience
                 exp_range = 100  # Experience sharing range
-                for char in self.characters:
-                    if not char.is_dead:
-                        dx = char.x - monster.x
-                        dy = char.y - monster.y
-                        distance = math.sqrt(dx**2 + dy**2)
-                        if distance <= exp_range:
-                            previous_level = char.level  # Store the level before gaining exp
-                            char.gain_exp(1)
-                            self.animations.append(
-                                Animation("+1 EXP", char.x, char.y, (0, 255, 255)))
-                            if char.level > previous_level:
-                                self.animations.append(
-                                    Animation(f"LEVEL UP! ({char.level})", 
-                                            char.x, char.y - 20, 
-                                            (255, 255, 0)))
+                for char in self.flow_field.characters_near(monster.x, monster.y, exp_range):
+                    previous_level = char.level  # Store the level before gaining exp
+                    char.gain_exp(1)
+                    self.add_effect("+1 EXP", char.x, char.y, (0, 255, 255), anchor=char)
+                    if char.level > previous_level:
+                        self.add_effect(f"LEVEL UP! ({char.level})", char.x, char.y - 20, (255, 255, 0))
                 
                 self.monsters.remove(monster)
-                self.animations.append(
-                    Animation("Monster defeated!", monster.x, monster.y, (255, 215, 0)))
+                self.add_effect("Monster defeated!", monster.x, monster.y, (255, 215, 0))
                 continue
             
-            # Find nearest character
-            nearest_char = None
-            min_distance = float('inf')
-            
-            for char in self.characters:
-                if char.is_dead:
-                    continue
-                
-                dx = char.x - monster.x
-                dy = char.y - monster.y
-                distance = math.sqrt(dx**2 + dy**2)
-                
-                # Check if character can attack monster
-                if distance <= char.attack_range:
+            # Characters in range attack the monster
+            for char in self.flow_field.characters_near(monster.x, monster.y, self.max_attack_range):
+                if math.hypot(char.x - monster.x, char.y - monster.y) <= char.attack_range:
                     if char.attack_monster(monster):
-                        self.animations.append(
-                            Animation(f"-{char.attack_damage}", monster.x, monster.y, (255, 215, 0)))
-                
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_char = char
+                        self.add_effect(f"-{char.attack_damage}", monster.x, monster.y, (255, 215, 0), anchor=monster)
+            
+            # The flow field knows which character is closest to the monster's cell
+            nearest_char = self.flow_field.nearest_character(monster.x, monster.y)
+            beyond_field = nearest_char is None and self.lod is not None
+            if beyond_field:
+                # Active because it is in view, but past the cut-off flow field: chase in a straight line
+                nearest_char = self.lod.nearest_character(self, monster)
             
             if nearest_char:
-                # Move towards nearest character
-                monster.move_towards(nearest_char.x, nearest_char.y)
+                distance = math.hypot(nearest_char.x - monster.x, nearest_char.y - monster.y)
+                monster_cell = self.grid.index(monster.x, monster.y)
+                if beyond_field or self.flow_field.distance[monster_cell] <= 1:
+                    # Close enough to go straight for the character
+                    monster.move_towards(nearest_char.x, nearest_char.y)
+                else:
+                    waypoint = self.flow_field.steer(monster.x, monster.y)
+                    if waypoint:
+                        monster.move_towards(*waypoint)
                 
                 # Attack if in range
-                if min_distance <= monster.attack_range and monster.can_attack():
+                if distance <= monster.attack_range and monster.can_attack():
                     nearest_char.hp -= monster.damage
                     monster.current_cooldown = monster.attack_cooldown
-                    self.animations.append(
-                        Animation(f"-{monster.damage} HP!", nearest_char.x, nearest_char.y, (255, 0, 0)))
-            
-            monster.update_cooldown()
+                    self.add_effect(f"-{monster.damage} HP!", nearest_char.x, nearest_char.y, (255, 0, 0),
+                                    anchor=nearest_char)
 
     def update_game_time(self):
         self.game_time += 1
 
+    def update_effects(self):
+        self.effects.update(self.game_time)
+
     def format_time(self):
         total_seconds = self.game_time // 60
         minutes = total_seconds // 60
@@ -636,91 +556,3 @@ class World:
             self.game_over = True
             return True
         return False
-
-    def draw_help_button(self, screen):
-        # Draw help button
-        pygame.draw.rect(screen, (0, 153, 255), self.help_button)
-        help_text = self.ui_font.render("Help", True, (255, 255, 255))
-        text_x = self.help_button.centerx - help_text.get_width() // 2
-        text_y = self.help_button.centery - help_text.get_height() // 2
-        screen.blit(help_text, (text_x, text_y))
-
-    def draw_help_overlay(self, screen):
-        if not self.show_help:
-            return
-        
-        # Semi-transparent overlay
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(180)
-        screen.blit(overlay, (0, 0))
-        
-        # Define help box dimensions
-        box_width = 400
-        box_height = 400
-        box_x = self.width//2 - box_width//2
-        box_y = 80
-        
-        # Draw help box background
-        pygame.draw.rect(screen, (40, 40, 40), (box_x, box_y, box_width, box_height))
-        # Draw box border
-        pygame.draw.rect(screen, (100, 100, 100), (box_x, box_y, box_width, box_height), 2)
-        
-        # Help content
-        help_title = self.title_font.render(f"Help (Page {self.help_page}/{self.total_help_pages})", True, (255, 255, 255))
-        screen.blit(help_title, (self.width//2 - help_title.get_width()//2, box_y + 20))
-        
-        # Different instructions based on page
-        if self.help_page == 1:
-            instructions = [
-                ("Basic Controls", True),  # True indicates it's a heading
-                ("1: Plant trees", False),
-                ("2: Plant food", False),
-                ("+/-: Game speed", False),
-                ("", False)
-            ]
-        elif self.help_page == 2:
-            instructions = [
-                ("Combat System", True),
-                ("Auto-attack nearby monsters", False),
-                ("Gain EXP from kills", False),
-                ("Share EXP in range", False),
-                ("", False),
-                ("Monsters", True),
-                ("Spawn from edges", False),
-                ("Get stronger over time", False)
-            ]
-        else:  # page 3
-            instructions = [
-                ("Resources", True),
-                ("Trees -> Wood", False),
-                ("Food -> Health", False),
-                ("Auto-regenerate", False),
-                ("", False),
-                ("Buildings", True),
-                ("Houses: 5 wood", False),
-                ("Heal nearby characters", False)
-            ]
-        
-        y = box_y + 80  # Start text below title
-        for line, is_heading in instructions:
-            font = self.title_font if is_heading else self.ui_font
-            text = font.render(line, True, (255, 255, 255))
-            screen.blit(text, (self.width//2 - text.get_width()//2, y))
-            y += 35 if is_heading else 30
-        
-        # Add arrow key indicators
-        if self.help_page > 1:
-            left_arrow = "<- Previous"
-        else:
-            left_arrow = "         "
-            
-        if self.help_page < self.total_help_pages:
-            right_arrow = "Next ->"
-        else:
-            right_arrow = "      "
-        
-        # Draw navigation hints with fixed spacing
-        spacing = " " * 20  # Create consistent space between arrows
-        nav_text = self.ui_font.render(f"{left_arrow}{spacing}{right_arrow}", True, (200, 200, 200))
-        screen.blit(nav_text, (self.width//2 - nav_text.get_width()//2, box_y + box_height - 50))
\ No newline at end of file
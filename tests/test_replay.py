@@ -0,0 +1,37 @@
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.replay import ReplayLearner, q_update  # noqa: E402
+from src.roster import Roster  # noqa: E402
+from src.world import World  # noqa: E402
+
+
+def test_duplicate_rows_take_one_averaged_step():
+    q = np.zeros((1, 5), dtype=np.float32)
+    agents = np.zeros(10, dtype=np.int32)
+    actions = np.zeros(10, dtype=np.int8)
+    rewards = np.ones(10, dtype=np.float32)
+    q_update(q, agents, actions, rewards, 0.5, 0.0)
+    assert q[0, 0] == 0.5
+    assert not q[0, 1:].any()
+
+
+def test_q_values_stay_finite_with_few_villagers():
+    for size in (1, 3):
+        random.seed(0)
+        world = World()
+        world.log_actions = False
+        world.populate(Roster(size=size, seed=0))
+        learner = world.learner = ReplayLearner(seed=0)
+        for _ in range(4000):
+            if world.game_over:
+                break
+            world.step()
+        assert np.isfinite(learner.q).all()
+        assert all(np.isfinite(value) for character in world.characters
+                   for value in character.q_table.values())